@@ -1,90 +1,30 @@
-from fastapi import APIRouter, Depends
-from datetime import datetime, timedelta
-from typing import Dict, List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from ...config import settings
 from ...database import Database
+from ...services.analytics_timeseries import EmailTimeSeries, _as_utc
 from ...services.ses_service import SESService
+from ...services.registry import ServiceRegistry
+from ...services.ses_stats_cache import SESStatisticsCache
 from ...api.routes.email import get_ses_service
 
 router = APIRouter()
 
+async def get_stats_cache() -> SESStatisticsCache:
+    return await ServiceRegistry.get_stats_cache()
+
 @router.get("/analytics")
 async def get_email_analytics(
-    ses_service: SESService = Depends(get_ses_service)
+    ses_service: SESService = Depends(get_ses_service),
+    stats_cache: SESStatisticsCache = Depends(get_stats_cache)
 ):
     """Combine MongoDB tracking data with SES statistics for comprehensive analytics"""
-    db = await Database.get_db()
-    
-    # Get SES statistics
-    ses_stats = await ses_service.get_send_statistics()
-    
-    # Get MongoDB statistics
-    mongo_pipeline = [
-        {
-            "$group": {
-                "_id": None,
-                "total_emails": {"$sum": 1},
-                "sent": {
-                    "$sum": {"$cond": [{"$eq": ["$status", "SENT"]}, 1, 0]}
-                },
-                "pending": {
-                    "$sum": {"$cond": [{"$eq": ["$status", "PENDING"]}, 1, 0]}
-                },
-                "scheduled": {
-                    "$sum": {"$cond": [{"$eq": ["$status", "SCHEDULED"]}, 1, 0]}
-                },
-                "failed": {
-                    "$sum": {"$cond": [{"$eq": ["$status", "FAILED"]}, 1, 0]}
-                }
-            }
-        }
-    ]
+    # Get SES statistics, pre-summed and refreshed in the background
+    ses_summary = stats_cache.get_summary()
     
-    db_stats = await db.emails.aggregate(mongo_pipeline).to_list(None)
-    db_stats = db_stats[0] if db_stats else {
-        "total_emails": 0, "sent": 0, "pending": 0, "scheduled": 0, "failed": 0
-    }
-
-    # Process SES data points
-    ses_summary = {
-        "total_delivery_attempts": 0,
-        "total_bounces": 0,
-        "total_complaints": 0,
-        "total_rejects": 0,
-        "delivery_attempts_24h": 0,
-        "bounces_24h": 0,
-        "complaints_24h": 0,
-        "rejects_24h": 0,
-        "time_series_data": [],
-        "success_rate": 0,
-        "bounce_rate": 0
-    }
-    
-    for point in ses_stats:
-        timestamp = point["Timestamp"]
-        data_point = {
-            "timestamp": timestamp,
-            "delivery_attempts": point["DeliveryAttempts"],
-            "bounces": point["Bounces"],
-            "complaints": point["Complaints"],
-            "rejects": point["Rejects"]
-        }
-        ses_summary["time_series_data"].append(data_point)
-        
-        # Update totals
-        ses_summary["total_delivery_attempts"] += point["DeliveryAttempts"]
-        ses_summary["total_bounces"] += point["Bounces"]
-        ses_summary["total_complaints"] += point["Complaints"]
-        ses_summary["total_rejects"] += point["Rejects"]
-    
-    # Calculate rates
-    if ses_summary["total_delivery_attempts"] > 0:
-        successful_deliveries = (ses_summary["total_delivery_attempts"] - 
-                               ses_summary["total_bounces"] - 
-                               ses_summary["total_rejects"])
-        ses_summary["success_rate"] = (successful_deliveries / 
-                                     ses_summary["total_delivery_attempts"]) * 100
-        ses_summary["bounce_rate"] = (ses_summary["total_bounces"] / 
-                                    ses_summary["total_delivery_attempts"]) * 100
+    # Get MongoDB statistics from the incrementally maintained rollup
+    db_stats = await ses_service.rollup.get_totals()
 
     # Combine both data sources
     return {
@@ -103,8 +43,50 @@ async def get_email_analytics(
                 "total_bounces": ses_summary["total_bounces"],
                 "total_complaints": ses_summary["total_complaints"],
                 "total_rejects": ses_summary["total_rejects"],
-                "success_rate": round(ses_summary["success_rate"], 2),
-                "bounce_rate": round(ses_summary["bounce_rate"], 2)
-            }
+                "success_rate": ses_summary["success_rate"],
+                "bounce_rate": ses_summary["bounce_rate"]
+            },
+            "last_updated": ses_summary["last_updated"]
         }
     }
+
+@router.get("/time-series")
+async def get_email_time_series(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    granularity: str = Query("hour", pattern="^(minute|hour|day)$"),
+    limit: int = Query(settings.ANALYTICS_MAX_BUCKETS, ge=1, le=settings.ANALYTICS_MAX_BUCKETS),
+    stats_cache: SESStatisticsCache = Depends(get_stats_cache)
+):
+    """
+    Sent, failed and bounce counts per minute/hour/day as parallel arrays.
+
+    Defaults to the last 7 days. Long ranges are paged: request the next
+    page with `start` set to the returned `next_start`.
+    """
+    # Query values without an offset are taken as UTC
+    end = _as_utc(end) if end else datetime.now(timezone.utc)
+    start = _as_utc(start) if start else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    time_series = EmailTimeSeries(await Database.get_db())
+    return await time_series.get_series(
+        start,
+        end,
+        granularity=granularity,
+        max_buckets=limit,
+        ses_data_points=stats_cache.get_data_points()
+    )
+
+@router.post("/rollups/rebuild")
+async def rebuild_email_rollups(
+    ses_service: SESService = Depends(get_ses_service)
+):
+    """Recompute the pre-aggregated status counts from the emails collection"""
+    return {"totals": await ses_service.writer.rebuild_rollup()}
+
+@router.get("/connection-pool")
+async def get_connection_pool_stats():
+    """Connection reuse statistics for the shared synchronous MongoDB client"""
+    return {"sync_mongo_pool": Database.sync_pool_stats.snapshot()}
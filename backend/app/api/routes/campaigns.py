@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+import json
+import tempfile
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.api.routes.csv import BulkEmailRequest, run_bulk_send
+from app.api.routes.email import get_ses_service, run_generate_and_send_bulk
+from app.models.schemas import FINISHED_CAMPAIGN_STATUSES
+from app.services.campaign_service import CampaignJobManager, CampaignRunner
+from app.services.registry import ServiceRegistry
+from app.services.ses_service import SESService
+
+router = APIRouter()
+
+async def get_campaign_manager() -> CampaignJobManager:
+    return await ServiceRegistry.get_campaign_manager()
+
+async def get_campaign_or_404(
+    campaign_id: str,
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+) -> dict:
+    campaign = await campaigns.get(campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
+
+def _spool_upload(source: BinaryIO) -> Tuple[BinaryIO, str]:
+    """Copy an upload to a temporary file; returns it rewound, with its SHA-256"""
+    digest = hashlib.sha256()
+    spooled = tempfile.TemporaryFile()
+    for chunk in iter(lambda: source.read(1 << 20), b""):
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()
+
+def _bulk_send_runner(spooled: BinaryIO, bulk_request: BulkEmailRequest, ses_service: SESService) -> CampaignRunner:
+    async def run(campaign_id, on_result, checkpoint):
+        try:
+            return await run_bulk_send(spooled, bulk_request, ses_service, campaign_id, on_result, checkpoint)
+        finally:
+            spooled.close()
+    return run
+
+def _generate_and_send_runner(contents: bytes, params: Dict, ses_service: SESService) -> CampaignRunner:
+    async def run(campaign_id, on_result, checkpoint):
+        return await run_generate_and_send_bulk(
+            contents, params["situation"], params["keywords"], params["recipient_column"],
+            params["scheduled_time"], params["mode"], ses_service, campaign_id, on_result, checkpoint
+        )
+    return run
+
+@router.post("/send-bulk-emails", status_code=202)
+async def submit_bulk_send(
+    file: UploadFile = File(...),
+    bulk_request: BulkEmailRequest = Depends(),
+    ses_service: SESService = Depends(get_ses_service),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """Start a CSV bulk send in the background and return its campaign id"""
+    # The upload is closed when this request ends, so keep our own copy for the job
+    spooled, digest = await asyncio.to_thread(_spool_upload, file.file)
+    campaign_id = await campaigns.submit(
+        "send-bulk-emails",
+        bulk_request.model_dump(),
+        _bulk_send_runner(spooled, bulk_request, ses_service),
+        upload_sha256=digest
+    )
+    return {"campaign_id": campaign_id, "status": "QUEUED"}
+
+@router.post("/generate-and-send-bulk", status_code=202)
+async def submit_generate_and_send_bulk(
+    file: UploadFile = File(...),
+    situation: str = Form(...),
+    keywords: List[str] = Form(...),
+    recipient_column: str = Form(...),
+    scheduled_time: Optional[datetime] = Form(None),
+    mode: str = Form("template"),
+    ses_service: SESService = Depends(get_ses_service),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """Start an LLM generate-and-send bulk run in the background and return its campaign id"""
+    contents = await file.read()
+    params = {
+        "situation": situation,
+        "keywords": keywords,
+        "recipient_column": recipient_column,
+        "scheduled_time": scheduled_time,
+        "mode": mode
+    }
+    campaign_id = await campaigns.submit(
+        "generate-and-send-bulk",
+        params,
+        _generate_and_send_runner(contents, params, ses_service),
+        upload_sha256=hashlib.sha256(contents).hexdigest()
+    )
+    return {"campaign_id": campaign_id, "status": "QUEUED"}
+
+@router.post("/{campaign_id}/resume", status_code=202)
+async def resume_campaign(
+    file: UploadFile = File(...),
+    campaign: dict = Depends(get_campaign_or_404),
+    ses_service: SESService = Depends(get_ses_service),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """
+    Resume an interrupted, failed or stalled campaign.
+
+    Upload the original file again; it is run with the campaign's stored
+    parameters and rows whose send was already recorded are skipped.
+    """
+    spooled = None
+    if campaign["kind"] == "send-bulk-emails":
+        spooled, digest = await asyncio.to_thread(_spool_upload, file.file)
+        run = _bulk_send_runner(spooled, BulkEmailRequest(**campaign["params"]), ses_service)
+    else:
+        contents = await file.read()
+        digest = hashlib.sha256(contents).hexdigest()
+        run = _generate_and_send_runner(contents, campaign["params"], ses_service)
+
+    try:
+        if digest != campaign.get("upload_sha256"):
+            raise HTTPException(status_code=409, detail="Upload does not match the campaign's original file")
+        try:
+            await campaigns.resume(campaign["_id"], run)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+    except HTTPException:
+        if spooled:
+            spooled.close()
+        raise
+    return {"campaign_id": campaign["_id"], "status": "QUEUED"}
+
+@router.get("/{campaign_id}")
+async def get_campaign(campaign: dict = Depends(get_campaign_or_404)):
+    """Campaign status and progress counters"""
+    return campaign
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+@router.get("/{campaign_id}/events")
+async def stream_campaign_events(
+    campaign: dict = Depends(get_campaign_or_404),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """
+    Server-sent events with live progress for a campaign.
+
+    Emits `progress` events (coalesced to at most
+    CAMPAIGN_PROGRESS_EVENTS_PER_SECOND) and one final `done` event with
+    the stored campaign summary.
+    """
+    campaign_id = campaign["_id"]
+
+    async def events():
+        if campaigns.feed.is_live(campaign_id):
+            async for snapshot in campaigns.feed.subscribe(campaign_id):
+                yield ": keep-alive\n\n" if snapshot is None else _sse("progress", snapshot)
+        else:
+            # Finished, or running in another worker process: follow the stored counters
+            last = None
+            while True:
+                current = await campaigns.get(campaign_id)
+                progress = {"status": current["status"], **current["progress"]}
+                if progress != last:
+                    last = progress
+                    yield _sse("progress", progress)
+                if current["status"] in FINISHED_CAMPAIGN_STATUSES:
+                    break
+                await asyncio.sleep(max(campaigns.feed.interval, 1.0))
+
+        final = await campaigns.get(campaign_id)
+        yield _sse("done", {
+            "status": final["status"],
+            "progress": final["progress"],
+            "skipped": final.get("skipped"),
+            "error": final.get("error")
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/{campaign_id}/results")
+async def get_campaign_results(
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    campaign: dict = Depends(get_campaign_or_404),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """
+    One page of per-row results in completion order.
+
+    Pass the returned `next_after` as `after` to fetch the next page; it is
+    None once the written results are exhausted.
+    """
+    results = await campaigns.get_results(campaign["_id"], after=after, limit=limit)
+    return {
+        "campaign_id": campaign["_id"],
+        "status": campaign["status"],
+        "results": results,
+        "next_after": results[-1]["seq"] if len(results) == limit else None
+    }
+
+@router.get("/{campaign_id}/results.ndjson")
+async def stream_campaign_results(
+    campaign: dict = Depends(get_campaign_or_404),
+    campaigns: CampaignJobManager = Depends(get_campaign_manager)
+):
+    """All results written so far as newline-delimited JSON, streamed from a cursor"""
+    async def lines():
+        async for result in campaigns.iter_results(campaign["_id"]):
+            yield json.dumps(jsonable_encoder(result)) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -1,17 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends
-from typing import List, Optional, Dict
-from pydantic import BaseModel
+import asyncio
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from typing import BinaryIO, Callable, Optional, Dict
+from pydantic import BaseModel, Field
 from datetime import datetime
-from io import StringIO
-import pandas as pd
-import csv
 
 from app.api.routes.email import get_ses_service
 
 from ...services.csv_service import CSVService, TemplateData
 from ...services.ses_service import SESService
-from ...database import Database
-from ...config import Settings
+from ...services.email_validator import RecipientValidator
+from ...services.suppression_service import RecipientFilter
+from ...services.campaign_service import CampaignCheckpoint
 
 router = APIRouter()
 
@@ -21,51 +20,114 @@ class BulkEmailRequest(BaseModel):
     placeholder_columns: str 
     recipient_column: str
     scheduled_time: Optional[datetime] = None
+    # Release scheduled sends in batches; defaults mirror EmailScheduleRequest
+    batch_size: int = Field(50, gt=0)
+    batch_interval_minutes: int = Field(60, ge=0)
+    # 'individual' renders and sends each row; 'ses_template' lets SES
+    # render rows via SendBulkTemplatedEmail, 50 recipients per call;
+    # 'raw_mime' sends each row via SendRawEmail from a prebuilt MIME skeleton
+    send_mode: str = "individual"
 
-@router.post("/send-bulk-emails")
-async def send_bulk_emails(
-    file: UploadFile = File(...),
-    bulk_request: BulkEmailRequest = Depends(),
-    ses_service: SESService = Depends(get_ses_service)
-):
-    try:
-        contents = await file.read()
-        file_contents = contents.decode('utf-8')
-        print(file_contents)
+async def run_bulk_send(
+    file: BinaryIO,
+    bulk_request: BulkEmailRequest,
+    ses_service: SESService,
+    campaign_id: Optional[str] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    checkpoint: Optional[CampaignCheckpoint] = None
+) -> Dict:
+    """
+    Send a CSV upload in the requested send mode.
+
+    Returns the per-row results (empty when streamed to `on_result`) with
+    the skipped-recipient counts and the rejected-rows report. Rows already
+    sent by an earlier attempt of the campaign are skipped via `checkpoint`.
+    """
+    # Fail on undecodable or malformed uploads before the first send
+    await asyncio.to_thread(CSVService.check_csv_stream, file)
+    # Rows are decoded and templated lazily as the dispatcher pulls them
+    reader = CSVService.open_csv_stream(file)
+    template_data = TemplateData(
+        template=bulk_request.template,
+        subject_template=bulk_request.subject_template,
+        placeholder_columns=bulk_request.placeholder_columns
+    )
+    placeholder_columns = CSVService.validate_columns(reader, template_data)
 
-        # Use csv.DictReader to read the CSV file
-        reader = csv.DictReader(StringIO(file_contents))
-        csv_data = list(reader)
-        print(csv_data)
+    if bulk_request.recipient_column not in reader.fieldnames:
+        raise ValueError(f"CSV is missing recipient column: {bulk_request.recipient_column}")
 
-        # Validate required columns
-        required_columns = set(bulk_request.placeholder_columns) | {bulk_request.recipient_column}
-        missing_columns = required_columns - set(csv_data[0].keys())
+    # Invalid, duplicate and suppressed recipients are dropped before anything is sent
+    await ses_service.suppressions.refresh()
+    validator = RecipientValidator(bulk_request.recipient_column)
+    recipient_filter = RecipientFilter(ses_service.suppressions, bulk_request.recipient_column)
 
-        print(required_columns)
-        print(missing_columns)
+    def filtered(rows):
+        rows = recipient_filter.apply(validator.apply(rows))
+        if checkpoint:
+            rows = checkpoint.apply(rows, bulk_request.recipient_column)
+        return rows
 
-        avail = ', '.join(csv_data[0].keys())
-        print(avail) 
-        # Process the CSV data using the CSVService
-        template_data = TemplateData(
+    if bulk_request.send_mode == "ses_template":
+        if bulk_request.scheduled_time:
+            raise ValueError("ses_template send mode does not support scheduled_time")
+        results = await ses_service.send_bulk_with_ses_template(
+            csv_data=filtered(reader),
             template=bulk_request.template,
             subject_template=bulk_request.subject_template,
-            placeholder_columns=bulk_request.placeholder_columns
+            placeholder_columns=placeholder_columns,
+            recipient_column=bulk_request.recipient_column,
+            campaign_id=campaign_id,
+            on_result=on_result
         )
-        csv_data = await CSVService.process_csv(file_contents, template_data)
-
-        # Send bulk emails
+    elif bulk_request.send_mode == "raw_mime":
+        if bulk_request.scheduled_time:
+            raise ValueError("raw_mime send mode does not support scheduled_time")
+        results = await ses_service.send_bulk_raw_mime(
+            csv_data=filtered(reader),
+            template=bulk_request.template,
+            subject_template=bulk_request.subject_template,
+            placeholder_columns=placeholder_columns,
+            recipient_column=bulk_request.recipient_column,
+            campaign_id=campaign_id,
+            on_result=on_result
+        )
+    elif bulk_request.send_mode == "individual":
         results = await ses_service.send_bulk_templated_emails(
-            csv_data=csv_data,
+            # Rows are rendered after validation, so templates see normalized addresses
+            # and rejected, suppressed or already sent rows are never rendered
+            csv_data=CSVService.render_rows(filtered(reader), template_data, placeholder_columns),
             recipient_column=bulk_request.recipient_column,
-            scheduled_time=bulk_request.scheduled_time
+            scheduled_time=bulk_request.scheduled_time,
+            batch_size=bulk_request.batch_size,
+            batch_interval_minutes=bulk_request.batch_interval_minutes,
+            campaign_id=campaign_id,
+            on_result=on_result
         )
+    else:
+        raise ValueError(f"Unknown send_mode: {bulk_request.send_mode}")
 
+    return {
+        "results": results,
+        "skipped": {**recipient_filter.summary(), **(checkpoint.summary() if checkpoint else {})},
+        "rejected": validator.report()
+    }
+
+@router.post("/send-bulk-emails")
+async def send_bulk_emails(
+    file: UploadFile = File(...),
+    bulk_request: BulkEmailRequest = Depends(),
+    ses_service: SESService = Depends(get_ses_service)
+):
+    """Send a CSV upload and wait for every row; see /campaigns for large uploads"""
+    try:
+        outcome = await run_bulk_send(file.file, bulk_request, ses_service)
         return {
             "status": "completed",
-            "total_processed": len(results),
-            "results": results
+            "total_processed": len(outcome["results"]),
+            "skipped": outcome["skipped"],
+            "rejected": outcome["rejected"],
+            "results": outcome["results"]
         }
 
     except Exception as e:
@@ -1,14 +1,16 @@
 from io import StringIO
 from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, File
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 import pandas as pd
 from pydantic import BaseModel, EmailStr
 from datetime import datetime
 
 from app.services.ses_service import SESService
-from app.services.csv_service import CSVService, TemplateData
-from app.config import Settings
-from app.database import Database
+from app.services.registry import ServiceRegistry
+from app.services.email_validator import RecipientValidator
+from app.services.suppression_service import RecipientFilter
+from app.services.campaign_service import CampaignCheckpoint
+from app.models.schemas import SuppressionReason
 
 
 router = APIRouter()
@@ -31,6 +33,11 @@ class EmailGenerationRequest(BaseModel):
 class VerifyEmailRequest(BaseModel):
     email: EmailStr
 
+class SuppressionRequest(BaseModel):
+    email: EmailStr
+    reason: SuppressionReason
+    details: Optional[str] = None
+
 class BulkEmailRequest(BaseModel):
     recipient_column: str
     template: str
@@ -38,8 +45,8 @@ class BulkEmailRequest(BaseModel):
     placeholder_columns: List[str]
     scheduled_time: Optional[datetime] = None
 
-def get_ses_service(settings: Settings = Depends(), db: Database = Depends(Database.get_db)):
-    return SESService(settings, db)
+async def get_ses_service() -> SESService:
+    return await ServiceRegistry.get_ses_service()
 
 @router.post("/send")
 async def send_email(
@@ -74,6 +81,107 @@ async def verify_email(
 ):
     return await ses_service.verify_email_identity(verify_request.email)
 
+@router.post("/suppressions")
+async def add_suppression(
+    suppression_request: SuppressionRequest,
+    ses_service: SESService = Depends(get_ses_service)
+):
+    """Stop sending to an address after a bounce, complaint or unsubscribe"""
+    return await ses_service.suppressions.add(
+        suppression_request.email,
+        suppression_request.reason,
+        suppression_request.details
+    )
+
+@router.delete("/suppressions/{email}")
+async def remove_suppression(
+    email: str,
+    ses_service: SESService = Depends(get_ses_service)
+):
+    if not await ses_service.suppressions.remove(email):
+        raise HTTPException(status_code=404, detail="Address is not suppressed")
+    return {"email": email, "suppressed": False}
+
+
+async def run_generate_and_send_bulk(
+    contents: bytes,
+    situation: str,
+    keywords: List[str],
+    recipient_column: str,
+    scheduled_time: Optional[datetime],
+    mode: str,
+    ses_service: SESService,
+    campaign_id: Optional[str] = None,
+    on_result: Optional[Callable[[Dict], None]] = None,
+    checkpoint: Optional[CampaignCheckpoint] = None
+) -> Dict:
+    """
+    Generate and send a personalized email per CSV row.
+
+    Returns the per-row results (empty when streamed to `on_result`) with
+    the skipped-recipient counts, the rejected-rows report and, in per_row
+    mode, the pipeline metrics. Rows already sent by an earlier attempt of
+    the campaign are skipped via `checkpoint`, before any generation.
+    """
+    # Invalid, duplicate and suppressed recipients are dropped before any generation or send
+    await ses_service.suppressions.refresh()
+    validator = RecipientValidator(recipient_column)
+    recipient_filter = RecipientFilter(ses_service.suppressions, recipient_column)
+
+    def filtered(rows):
+        rows = recipient_filter.apply(rows)
+        if checkpoint:
+            rows = checkpoint.apply(rows, recipient_column)
+        return rows
+
+    def skipped():
+        return {**recipient_filter.summary(), **(checkpoint.summary() if checkpoint else {})}
+
+    if mode == "template":
+        df = pd.read_csv(StringIO(contents.decode()), dtype=str, keep_default_na=False)
+        if recipient_column not in df.columns:
+            raise HTTPException(status_code=400, detail=f"CSV is missing recipient column: {recipient_column}")
+        df = validator.apply_frame(df)
+        try:
+            results = await ses_service.generate_and_send_bulk_from_template(
+                csv_data=list(filtered(df.to_dict('records'))),
+                recipient_column=recipient_column,
+                situation=situation,
+                keywords=keywords,
+                scheduled_time=scheduled_time,
+                campaign_id=campaign_id,
+                on_result=on_result
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=502, detail=f"Failed to generate email template: {str(e)}")
+        return {
+            'results': results,
+            'skipped': skipped(),
+            'rejected': validator.report()
+        }
+
+    df = pd.read_csv(StringIO(contents.decode()))
+    if recipient_column not in df.columns:
+        raise HTTPException(status_code=400, detail=f"CSV is missing recipient column: {recipient_column}")
+    df = validator.apply_frame(df)
+
+    # Generation, rendering, sending and persistence run as overlapping pipeline stages
+    results, pipeline_metrics = await ses_service.generate_and_send_bulk_per_row(
+        csv_data=filtered(df.to_dict('records')),
+        recipient_column=recipient_column,
+        situation=situation,
+        keywords=keywords,
+        scheduled_time=scheduled_time,
+        campaign_id=campaign_id,
+        on_result=on_result
+    )
+    return {
+        'results': results,
+        'skipped': skipped(),
+        'rejected': validator.report(),
+        'pipeline_metrics': pipeline_metrics
+    }
+
 
 @router.post("/generate-and-send-bulk")
 async def generate_and_send_bulk_emails(
@@ -82,47 +190,23 @@ async def generate_and_send_bulk_emails(
     keywords: List[str] = Form(...),
     recipient_column: str = Form(...),
     scheduled_time: Optional[datetime] = Form(None),
+    mode: str = Form("template"),
     ses_service: SESService = Depends(get_ses_service)
 ):
+    """
+    Generate and send a personalized email per CSV row.
+
+    mode="template" (default) asks the LLM once for a cached {Column} template
+    and renders it locally per row; mode="per_row" calls the LLM for every row.
+    Waits for every row; see /campaigns for large uploads.
+    """
     # Read CSV file
     contents = await file.read()
-    df = pd.read_csv(StringIO(contents.decode()))
-    
-    results = []
-    for _, row in df.iterrows():
-        try:
-            # Get recipient email from the specified column
-            recipient_email = row[recipient_column]
-            
-            # Create template data from row
-            template_data = row.to_dict()
-            
-            # Generate and send personalized email
-            result = await ses_service.generate_and_send(
-                to_addresses=[recipient_email],
-                situation=situation,
-                keywords=keywords,
-                template_data=template_data,
-                scheduled_time=scheduled_time
-            )
-            
-            results.append({
-                'status': 'success',
-                'email': recipient_email,
-                'result': result
-            })
-            
-        except Exception as e:
-            results.append({
-                'status': 'error',
-                'email': row.get(recipient_column, 'unknown'),
-                'error': str(e)
-            })
-    
+    outcome = await run_generate_and_send_bulk(
+        contents, situation, keywords, recipient_column, scheduled_time, mode, ses_service
+    )
     return {
         'status': 'completed',
-        'total_processed': len(results),
-        'results': results
+        'total_processed': len(outcome['results']),
+        **outcome
     }
-
-
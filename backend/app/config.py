@@ -1,4 +1,5 @@
 
+import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -26,9 +27,104 @@ class Settings:
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY")
     SENDER_EMAIL: str = os.getenv("SENDER_EMAIL")
 
+    # Connection pool size of the synchronous MongoDB client used by scheduler threads
+    MONGODB_SYNC_POOL_SIZE: int = int(os.getenv("MONGODB_SYNC_POOL_SIZE", "20"))
+
+    # Scheduled email workers; each claims due emails from MongoDB under a lease
+    SCHEDULER_WORKERS: int = int(os.getenv("SCHEDULER_WORKERS", "2"))
+    SCHEDULER_POLL_INTERVAL_SECONDS: float = float(os.getenv("SCHEDULER_POLL_INTERVAL_SECONDS", "5"))
+    SCHEDULER_LEASE_SECONDS: int = int(os.getenv("SCHEDULER_LEASE_SECONDS", "300"))
+
+    # Write-behind buffering of email records
+    EMAIL_WRITE_BATCH_SIZE: int = int(os.getenv("EMAIL_WRITE_BATCH_SIZE", "500"))
+    EMAIL_WRITE_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("EMAIL_WRITE_FLUSH_INTERVAL_SECONDS", "1.0"))
+
+    # Stage sizes for the generate-and-send-bulk row pipeline
+    PIPELINE_GENERATE_WORKERS: int = int(os.getenv("PIPELINE_GENERATE_WORKERS", os.getenv("LLM_MAX_CONCURRENCY", "4")))
+    PIPELINE_PERSIST_WORKERS: int = int(os.getenv("PIPELINE_PERSIST_WORKERS", "4"))
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "100"))
+
+    # LLM client: 'openrouter' or 'stub' for offline load testing
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openrouter")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "meta-llama/llama-3.2-3b-instruct:free")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_STUB_LATENCY_MS: float = float(os.getenv("LLM_STUB_LATENCY_MS", "500"))
+
+    # LLM-generated templates reused across generate-and-send-bulk runs
+    LLM_TEMPLATE_CACHE_SIZE: int = int(os.getenv("LLM_TEMPLATE_CACHE_SIZE", "256"))
+    LLM_TEMPLATE_CACHE_TTL_HOURS: float = float(os.getenv("LLM_TEMPLATE_CACHE_TTL_HOURS", "168"))
+
+    # Bulk sends reload the suppression list when it is older than this, so
+    # suppressions added by other worker processes are honoured; 0 reloads every time
+    SUPPRESSION_REFRESH_SECONDS: float = float(os.getenv("SUPPRESSION_REFRESH_SECONDS", "30"))
+
+    # Bulk dispatch tuning
+    BULK_SEND_CONCURRENCY: int = int(os.getenv("BULK_SEND_CONCURRENCY", "10"))
+    # Max sends per second; 0 means use MaxSendRate from SES GetSendQuota
+    SES_MAX_SEND_RATE: float = float(os.getenv("SES_MAX_SEND_RATE", "0"))
+    # Destinations per SendBulkTemplatedEmail call (SES allows at most 50)
+    SES_BULK_DESTINATIONS: int = min(50, int(os.getenv("SES_BULK_DESTINATIONS", "50")))
+    # Adaptive send rate: halved on SES throttling, then raised by SES_RATE_INCREASE
+    # per second (0 means 1% of the max rate) back up to the max send rate
+    SES_RATE_MIN: float = float(os.getenv("SES_RATE_MIN", "1"))
+    SES_RATE_INCREASE: float = float(os.getenv("SES_RATE_INCREASE", "0"))
+    SES_RATE_DECREASE_FACTOR: float = float(os.getenv("SES_RATE_DECREASE_FACTOR", "0.5"))
+    # Transient SES errors are retried in place with jittered backoff, then
+    # re-queued for the scheduler up to SES_MAX_REQUEUES times before FAILED
+    SES_SEND_MAX_ATTEMPTS: int = int(os.getenv("SES_SEND_MAX_ATTEMPTS", "4"))
+    SES_RETRY_BACKOFF_SECONDS: float = float(os.getenv("SES_RETRY_BACKOFF_SECONDS", "0.5"))
+    SES_REQUEUE_DELAY_SECONDS: float = float(os.getenv("SES_REQUEUE_DELAY_SECONDS", "30"))
+    SES_MAX_REQUEUES: int = int(os.getenv("SES_MAX_REQUEUES", "5"))
+    # Sender shards as a JSON list of {"name", "region", "sender", "access_key_id",
+    # "secret_access_key", "max_send_rate", "weight"}; each gets its own SES client
+    # and adaptive rate. Empty means one shard from AWS_REGION and SENDER_EMAIL
+    SES_SHARDS: str = os.getenv("SES_SHARDS", "")
+    # A shard with this many transient send failures in a row is skipped for the cooldown
+    SES_SHARD_FAILURE_THRESHOLD: int = int(os.getenv("SES_SHARD_FAILURE_THRESHOLD", "5"))
+    SES_SHARD_COOLDOWN_SECONDS: float = float(os.getenv("SES_SHARD_COOLDOWN_SECONDS", "30"))
+
+    # Per-row campaign job results are written in batches of this size
+    CAMPAIGN_RESULTS_BATCH_SIZE: int = int(os.getenv("CAMPAIGN_RESULTS_BATCH_SIZE", "200"))
+    # Upper bound on live progress events per second for each campaign
+    CAMPAIGN_PROGRESS_EVENTS_PER_SECOND: float = float(os.getenv("CAMPAIGN_PROGRESS_EVENTS_PER_SECOND", "4"))
+    # A RUNNING campaign without a heartbeat for this long is treated as dead and may be resumed
+    CAMPAIGN_STALE_SECONDS: int = int(os.getenv("CAMPAIGN_STALE_SECONDS", "60"))
+
+    # Most buckets returned per page by the analytics time-series endpoint
+    ANALYTICS_MAX_BUCKETS: int = int(os.getenv("ANALYTICS_MAX_BUCKETS", "1000"))
+
+    # SES send statistics cache for the analytics endpoint
+    SES_STATS_TTL_SECONDS: float = float(os.getenv("SES_STATS_TTL_SECONDS", "900"))
+    SES_STATS_REFRESH_SECONDS: float = float(os.getenv("SES_STATS_REFRESH_SECONDS", "300"))
+
+    # SES transport: 'boto3' for AWS, 'fake' for offline benchmarking
+    SES_TRANSPORT: str = os.getenv("SES_TRANSPORT", "boto3")
+    SES_EXECUTOR_WORKERS: int = int(os.getenv("SES_EXECUTOR_WORKERS", "16"))
+    # HTTP connections kept open by the shared boto3 client; match the executor size
+    SES_MAX_POOL_CONNECTIONS: int = int(os.getenv("SES_MAX_POOL_CONNECTIONS", os.getenv("SES_EXECUTOR_WORKERS", "16")))
+    SES_FAKE_LATENCY_MS: float = float(os.getenv("SES_FAKE_LATENCY_MS", "50"))
+    # The fake client answers Throttling above this many recipients per second; 0 disables
+    SES_FAKE_THROTTLE_RATE: float = float(os.getenv("SES_FAKE_THROTTLE_RATE", "0"))
+
 # Global settings instance
 settings = Settings()
 
+def _redact_shards(value: str) -> str:
+    """SES_SHARDS with every credential field hidden"""
+    try:
+        shards = json.loads(value) if value.strip() else []
+        return json.dumps([
+            {
+                name: '***HIDDEN***' if 'secret' in name.lower() or 'key' in name.lower() else field
+                for name, field in shard.items()
+            }
+            for shard in shards
+        ])
+    except (ValueError, AttributeError, TypeError):
+        return '***HIDDEN***'
+
 # For debugging purposes
 def print_settings():
     print("\nCurrent Settings:")
@@ -36,6 +132,8 @@ def print_settings():
         # Don't print sensitive information
         if 'secret' in field.lower() or 'password' in field.lower() or 'key' in field.lower():
             value = '***HIDDEN***'
+        elif field == 'SES_SHARDS':
+            value = _redact_shards(settings.SES_SHARDS)
         else:
             value = getattr(settings, field)
         print(f"{field}: {value}")
\ No newline at end of file
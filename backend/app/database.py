@@ -1,10 +1,97 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient, monitoring
 from .config import settings
-from typing import Optional
+from typing import Dict, List, Optional
 import logging
+import threading
+
+def get_index_models() -> Dict[str, List[IndexModel]]:
+    """Indexes backing the application's query shapes, per collection"""
+    return {
+        "emails": [
+            # EmailScheduler claims: status SCHEDULED and scheduled_time <= now, oldest first
+            IndexModel([("status", ASCENDING), ("scheduled_time", ASCENDING)], name="status_scheduled_time"),
+            IndexModel([("message_id", ASCENDING)], name="message_id", sparse=True),
+            IndexModel([("created_at", DESCENDING)], name="created_at"),
+            IndexModel([("sent_at", ASCENDING)], name="sent_at", sparse=True),
+            IndexModel([("failed_at", ASCENDING)], name="failed_at", sparse=True),
+            IndexModel([("campaign_id", ASCENDING), ("status", ASCENDING)], name="campaign_id_status"),
+            IndexModel([("batch_id", ASCENDING), ("status", ASCENDING)], name="batch_id_status"),
+        ],
+        "campaign_results": [
+            IndexModel([("campaign_id", ASCENDING), ("seq", ASCENDING)], name="campaign_id_seq", unique=True),
+        ],
+        "email_batches": [
+            IndexModel([("status", ASCENDING), ("release_time", ASCENDING)], name="status_release_time"),
+        ],
+        "llm_templates": [
+            IndexModel(
+                [("created_at", ASCENDING)],
+                name="created_at_ttl",
+                expireAfterSeconds=int(settings.LLM_TEMPLATE_CACHE_TTL_HOURS * 3600)
+            ),
+        ],
+    }
+
+class ConnectionPoolStats(monitoring.ConnectionPoolListener):
+    """Counts pool events so connection reuse can be reported"""
+
+    def __init__(self):
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.checkouts += 1
+
+    def connection_checked_in(self, event):
+        pass
+
+    def snapshot(self) -> Dict:
+        reused = max(self.checkouts - self.connections_created, 0)
+        return {
+            "connections_created": self.connections_created,
+            "connections_closed": self.connections_closed,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "reused_checkouts": reused,
+            "reuse_ratio": round(reused / self.checkouts, 4) if self.checkouts else 0.0
+        }
 
 class Database:
     client: Optional[AsyncIOMotorClient] = None # type: ignore
+    # Shared synchronous client for scheduler threads, which can't use Motor
+    sync_client: Optional[MongoClient] = None
+    sync_pool_stats = ConnectionPoolStats()
+    _sync_lock = threading.Lock()
     
     # settings = get_settings()
     @classmethod
@@ -22,10 +109,38 @@ class Database:
     async def close_db(cls):
         if cls.client:
             try:
-                await cls.client.close()
+                cls.client.close()
                 logging.info("MongoDB connection closed")
             except Exception as e:
                 logging.error(f"Error closing MongoDB connection: {e}")
+        if cls.sync_client:
+            logging.info(f"Sync MongoDB pool stats: {cls.sync_pool_stats.snapshot()}")
+            cls.sync_client.close()
+            cls.sync_client = None
+    
+    @classmethod
+    def get_sync_db(cls):
+        """Return the database from the shared, pooled synchronous client"""
+        if cls.sync_client is None:
+            with cls._sync_lock:
+                if cls.sync_client is None:
+                    cls.sync_client = MongoClient(
+                        settings.MONGODB_URL,
+                        maxPoolSize=settings.MONGODB_SYNC_POOL_SIZE,
+                        event_listeners=[cls.sync_pool_stats]
+                    )
+        return cls.sync_client.email_sender
+    
+    @classmethod
+    async def ensure_indexes(cls):
+        """Create any missing indexes; existing ones are left untouched"""
+        db = await cls.get_db()
+        for collection, models in get_index_models().items():
+            try:
+                names = await db[collection].create_indexes(models)
+                logging.info(f"Ensured indexes on {collection}: {', '.join(names)}")
+            except Exception as e:
+                logging.error(f"Error creating indexes on {collection}: {e}")
     
     @classmethod
     async def get_db(cls):
@@ -1,7 +1,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api.routes import csv, email, analytics
+from .api.routes import csv, email, analytics, campaigns
 from .database import Database
+from .services.registry import ServiceRegistry
 from .config import  print_settings, settings
 
 app = FastAPI(
@@ -23,13 +24,19 @@ async def startup_db_client():
     try:
         await Database.connect_db()
         print("Database connected successfully.")
+        await Database.ensure_indexes()
+        await ServiceRegistry.startup()
+        # Keep SES statistics warm so analytics requests never wait on AWS
+        ServiceRegistry.stats_cache.start()
     except Exception as e:
         print(f"Database connection failed: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await ServiceRegistry.shutdown()
     await Database.close_db()
 
 app.include_router(csv.router, prefix="/csv", tags=["CSV"])
 app.include_router(email.router, prefix="/email", tags=["Email"])
 app.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
+app.include_router(campaigns.router, prefix="/campaigns", tags=["Campaigns"])
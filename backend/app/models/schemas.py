@@ -15,6 +15,20 @@ class DeliveryStatus(str, Enum):
     BOUNCED = "bounced"
     OPENED = "opened"
 
+class CampaignStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+    INTERRUPTED = "INTERRUPTED"
+
+FINISHED_CAMPAIGN_STATUSES = {CampaignStatus.COMPLETED, CampaignStatus.FAILED, CampaignStatus.INTERRUPTED}
+
+class SuppressionReason(str, Enum):
+    BOUNCE = "bounce"
+    COMPLAINT = "complaint"
+    UNSUBSCRIBE = "unsubscribe"
+
 class EmailContent(BaseModel):
     subject: str
     html_body: str
@@ -0,0 +1,134 @@
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from pymongo import UpdateOne
+
+from app.models.schemas import EmailStatus
+
+logger = logging.getLogger(__name__)
+
+TOTALS_ID = "totals"
+STATUS_FIELDS = {status: status.value.lower() for status in EmailStatus}
+EMPTY_TOTALS = {"total_emails": 0, "sent": 0, "pending": 0, "scheduled": 0, "failed": 0}
+
+
+class AnalyticsRollup:
+    """
+    Pre-aggregated email counters in the `email_rollups` collection.
+
+    The `totals` document holds the current count per status, and one
+    document per hour counts emails created, sent and failed in that hour.
+    Status transitions are accumulated in memory (from the event loop and
+    scheduler threads alike) and applied with batched $inc upserts, so
+    reading analytics is a single document lookup.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Counter] = defaultdict(Counter)
+        self._buckets: Dict[str, datetime] = {}
+
+    @staticmethod
+    def _status_field(status) -> str:
+        return STATUS_FIELDS[EmailStatus(status)]
+
+    def _hour(self, at: Optional[datetime]) -> str:
+        at = at or datetime.now(timezone.utc)
+        bucket = at.replace(minute=0, second=0, microsecond=0)
+        bucket_id = f"hour:{bucket:%Y-%m-%dT%H}"
+        self._buckets[bucket_id] = bucket
+        return bucket_id
+
+    def record_insert(self, record: Dict):
+        """Count a newly created email record"""
+        field = self._status_field(record["status"])
+        with self._lock:
+            self._pending[TOTALS_ID].update({"total_emails": 1, field: 1})
+            self._pending[self._hour(record.get("created_at"))]["created"] += 1
+            if field in ("sent", "failed"):
+                self._pending[self._hour(record.get(f"{field}_at"))][field] += 1
+
+    def record_transition(self, previous_status, status, at: Optional[datetime] = None):
+        """Count an email moving from `previous_status` to `status`"""
+        if previous_status is not None and EmailStatus(previous_status) == EmailStatus(status):
+            return
+        field = self._status_field(status)
+        with self._lock:
+            if previous_status is not None:
+                self._pending[TOTALS_ID][self._status_field(previous_status)] -= 1
+            self._pending[TOTALS_ID][field] += 1
+            if field in ("sent", "failed"):
+                self._pending[self._hour(at)][field] += 1
+
+    def _take_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(Counter)
+            buckets, self._buckets = self._buckets, {}
+        return pending, buckets
+
+    def _restore_pending(self, pending: Dict[str, Counter], buckets: Dict[str, datetime]):
+        with self._lock:
+            for doc_id, counts in pending.items():
+                self._pending[doc_id].update(counts)
+            self._buckets.update(buckets)
+
+    async def flush(self):
+        """Apply accumulated counter deltas with one unordered bulk_write"""
+        pending, buckets = self._take_pending()
+        operations = []
+        for doc_id, counts in pending.items():
+            increments = {field: value for field, value in counts.items() if value}
+            if not increments:
+                continue
+            update = {"$inc": increments}
+            if doc_id in buckets:
+                update["$setOnInsert"] = {"bucket": buckets[doc_id]}
+            operations.append(UpdateOne({"_id": doc_id}, update, upsert=True))
+
+        if not operations:
+            return
+        try:
+            await self.db.email_rollups.bulk_write(operations, ordered=False)
+        except Exception:
+            self._restore_pending(pending, buckets)
+            raise
+
+    async def rebuild(self) -> Dict:
+        """
+        Recompute the totals document from the emails collection.
+
+        Pending deltas are counted on top of whatever this stores, so with
+        an EmailRecordWriter use its `rebuild_rollup`, which flushes them
+        first and holds off further flushes until the totals are replaced.
+        """
+        pipeline = [
+            {
+                "$group": {
+                    "_id": None,
+                    "total_emails": {"$sum": 1},
+                    **{
+                        field: {"$sum": {"$cond": [{"$eq": ["$status", status.value]}, 1, 0]}}
+                        for status, field in STATUS_FIELDS.items()
+                    }
+                }
+            }
+        ]
+        stats = await self.db.emails.aggregate(pipeline).to_list(None)
+        totals = {**EMPTY_TOTALS, **(stats[0] if stats else {})}
+        totals.pop("_id", None)
+
+        await self.db.email_rollups.replace_one({"_id": TOTALS_ID}, {"_id": TOTALS_ID, **totals}, upsert=True)
+        logger.info(f"Rebuilt email rollup totals: {totals}")
+        return totals
+
+    async def get_totals(self) -> Dict:
+        """Current per-status counts, rebuilding them once if they don't exist yet"""
+        totals = await self.db.email_rollups.find_one({"_id": TOTALS_ID})
+        if totals is None:
+            return await self.rebuild()
+        totals.pop("_id", None)
+        return {**EMPTY_TOTALS, **totals}
@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+GRANULARITIES = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1)
+}
+
+# Email timestamp field counted for each series
+SERIES_FIELDS = {"sent": "sent_at", "failed": "failed_at"}
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def truncate(value: datetime, granularity: str) -> datetime:
+    """Start of the bucket containing `value`, matching $dateTrunc in UTC"""
+    value = _as_utc(value).replace(second=0, microsecond=0)
+    if granularity in ("hour", "day"):
+        value = value.replace(minute=0)
+    if granularity == "day":
+        value = value.replace(hour=0)
+    return value
+
+
+class EmailTimeSeries:
+    """
+    Per-bucket sent, failed and bounce counts over a time range.
+
+    Sent and failed counts are bucketed in MongoDB with $dateTrunc over the
+    indexed `sent_at`/`failed_at` fields, so only one row per non-empty
+    bucket leaves the server. Bounces come from the cached SES send
+    statistics. Results are returned as parallel arrays and paged by a
+    maximum number of buckets.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def _count_by_bucket(self, field: str, start: datetime, end: datetime, granularity: str) -> Dict[datetime, int]:
+        pipeline = [
+            {"$match": {field: {"$gte": start, "$lt": end}}},
+            {
+                "$group": {
+                    "_id": {"$dateTrunc": {"date": f"${field}", "unit": granularity, "timezone": "UTC"}},
+                    "count": {"$sum": 1}
+                }
+            }
+        ]
+        rows = await self.db.emails.aggregate(pipeline).to_list(None)
+        return {_as_utc(row["_id"]): row["count"] for row in rows}
+
+    async def get_series(
+        self,
+        start: datetime,
+        end: datetime,
+        granularity: str = "hour",
+        max_buckets: int = 1000,
+        ses_data_points: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Columnar series for [start, end), limited to `max_buckets` buckets.
+
+        When the range needs more buckets, `next_start` is the `start` to
+        request for the following page; otherwise it is None.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        step = GRANULARITIES[granularity]
+        start = truncate(start, granularity)
+        end = _as_utc(end)
+
+        page_end = min(end, start + step * max_buckets)
+        next_start = page_end if page_end < end else None
+
+        sent, failed = await asyncio.gather(*(
+            self._count_by_bucket(field, start, page_end, granularity)
+            for field in SERIES_FIELDS.values()
+        ))
+
+        bounces: Dict[datetime, int] = {}
+        for point in ses_data_points or []:
+            timestamp = _as_utc(point["Timestamp"])
+            if start <= timestamp < page_end:
+                bucket = truncate(timestamp, granularity)
+                bounces[bucket] = bounces.get(bucket, 0) + point["Bounces"]
+
+        buckets = []
+        bucket = start
+        while bucket < page_end:
+            buckets.append(bucket)
+            bucket += step
+
+        return {
+            "granularity": granularity,
+            "start": start,
+            "end": page_end,
+            "next_start": next_start,
+            "timestamps": [bucket.isoformat() for bucket in buckets],
+            "sent": [sent.get(bucket, 0) for bucket in buckets],
+            "failed": [failed.get(bucket, 0) for bucket in buckets],
+            "bounces": [bounces.get(bucket, 0) for bucket in buckets]
+        }
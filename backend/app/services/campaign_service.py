@@ -0,0 +1,366 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError
+
+from app.models.schemas import CampaignStatus
+from app.services.email_writer import DUPLICATE_KEY_ERROR
+from app.services.progress_feed import ProgressFeed
+
+logger = logging.getLogger(__name__)
+
+
+def row_key(campaign_id: str, row: Dict) -> str:
+    """Deterministic idempotency key of one CSV row within a campaign"""
+    payload = json.dumps(row, sort_keys=True, default=str)
+    return hashlib.sha256(f"{campaign_id}\x00{payload}".encode()).hexdigest()[:32]
+
+
+class CampaignCheckpoint:
+    """
+    Skips rows an earlier attempt of the same campaign already sent.
+
+    `done` holds the row keys stored with that attempt's successful
+    results, so each row is checked with one set lookup instead of a query.
+    Rows that are let through are remembered by recipient until their
+    result arrives; `wrap` then stores the row key with a successful result
+    so the results collection itself is the checkpoint, written in the
+    recorder's batches.
+    """
+
+    def __init__(self, campaign_id: str, done: Optional[Set[str]] = None):
+        self.campaign_id = campaign_id
+        self.done = done or set()
+        self.already_sent = 0
+        self._pending: Dict[str, str] = {}
+
+    def apply(self, rows: Iterable[Dict], recipient_column: str) -> Iterator[Dict]:
+        for row in rows:
+            key = row_key(self.campaign_id, row)
+            if key in self.done:
+                self.already_sent += 1
+                continue
+            recipient = row.get(recipient_column)
+            if isinstance(recipient, str):
+                self._pending[recipient] = key
+            yield row
+
+    def wrap(self, on_result: Callable[[Dict], None]) -> Callable[[Dict], None]:
+        def record(result: Dict):
+            key = self._pending.pop(result.get('email'), None)
+            if key is not None and result.get('status') != 'error':
+                result = {**result, "row_key": key}
+            on_result(result)
+        return record
+
+    def summary(self) -> Dict:
+        return {"already_sent": self.already_sent}
+
+
+# Runs a campaign: receives its id, a per-row result callback and the
+# checkpoint to filter rows through, and returns a summary with optional
+# "skipped" counts and a "rejected" report
+CampaignRunner = Callable[[str, Callable[[Dict], None], CampaignCheckpoint], Awaitable[Dict]]
+
+
+class CampaignRecorder:
+    """
+    Write-behind buffer for the per-row results of one campaign.
+
+    `record` is synchronous so it can be used as a dispatcher or pipeline
+    callback. Results get a sequence number in completion order and are
+    written to `campaign_results` with insert_many, together with one $inc
+    of the campaign's progress counters, every `batch_size` results or
+    `flush_interval` seconds. While idle it still touches `updated_at`
+    every `heartbeat_interval` seconds so other processes can tell a live
+    campaign from one whose process died.
+
+    A resumed campaign starts from the `seq` and `totals` kept from its
+    earlier attempts.
+    """
+
+    def __init__(
+        self,
+        db,
+        campaign_id: str,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        heartbeat_interval: float = 10.0,
+        seq: int = 0,
+        totals: Optional[Dict] = None
+    ):
+        self.db = db
+        self.campaign_id = campaign_id
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.seq = seq
+        self.totals: Counter = Counter(totals or {})
+        self._started = time.monotonic()
+        self._last_write = self._started
+        self._processed_at_start = sum(self.totals.values())
+        self._buffer: List[Dict] = []
+        self._counts: Counter = Counter()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def record(self, result: Dict):
+        self.seq += 1
+        self._buffer.append({"campaign_id": self.campaign_id, "seq": self.seq, **result})
+        status = result.get('status')
+        if status == 'rejected':
+            outcome = "rejected"
+        elif status == 'error':
+            outcome = "failed"
+        else:
+            outcome = "succeeded"
+        self.totals[outcome] += 1
+        self._counts["progress.processed"] += 1
+        self._counts[f"progress.{outcome}"] += 1
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def snapshot(self) -> Dict:
+        """Live in-memory progress, ahead of what has been flushed to MongoDB"""
+        elapsed = time.monotonic() - self._started
+        processed = sum(self.totals.values())
+        # Throughput covers this attempt only
+        sent_now = processed - self._processed_at_start
+        return {
+            "processed": processed,
+            "succeeded": self.totals["succeeded"],
+            "failed": self.totals["failed"],
+            "rejected": self.totals["rejected"],
+            "elapsed_seconds": round(elapsed, 1),
+            "throughput_per_second": round(sent_now / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Campaign {self.campaign_id} result flush failed, will retry: {str(e)}")
+
+    async def flush(self):
+        buffer, self._buffer = self._buffer, []
+        counts, self._counts = self._counts, Counter()
+        if not buffer:
+            if time.monotonic() - self._last_write >= self.heartbeat_interval:
+                await self.db.campaigns.update_one(
+                    {"_id": self.campaign_id},
+                    {"$set": {"updated_at": datetime.now(timezone.utc)}}
+                )
+                self._last_write = time.monotonic()
+            return
+        try:
+            try:
+                await self.db.campaign_results.insert_many(buffer, ordered=False)
+            except BulkWriteError as e:
+                # Duplicates come from a retried flush that partially succeeded
+                failed = [
+                    buffer[error["index"]] for error in e.details.get("writeErrors", [])
+                    if error.get("code") != DUPLICATE_KEY_ERROR
+                ]
+                if failed:
+                    buffer = failed
+                    raise
+            await self.db.campaigns.update_one(
+                {"_id": self.campaign_id},
+                {"$inc": dict(counts), "$set": {"updated_at": datetime.now(timezone.utc)}}
+            )
+            self._last_write = time.monotonic()
+        except Exception:
+            self._buffer = buffer + self._buffer
+            self._counts.update(counts)
+            raise
+
+    async def close(self):
+        self._closed = True
+        if self._task:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+class CampaignJobManager:
+    """
+    Runs bulk sends as background campaign jobs.
+
+    Each campaign has a `campaigns` document with its status and progress
+    counters, and its per-row results are stored in `campaign_results`
+    ordered by `seq`, so clients poll progress and page or stream results
+    instead of holding one request open for the whole send.
+
+    Campaigns that were interrupted, failed, or stopped heartbeating
+    because their process died can be resumed with the same upload; rows
+    whose success was already recorded are skipped (see CampaignCheckpoint).
+    """
+
+    def __init__(
+        self,
+        db,
+        results_batch_size: int = 200,
+        feed: Optional[ProgressFeed] = None,
+        stale_seconds: int = 60
+    ):
+        self.db = db
+        self.results_batch_size = results_batch_size
+        self.feed = feed or ProgressFeed()
+        self.stale_seconds = stale_seconds
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _start(self, campaign_id: str, run: CampaignRunner, checkpoint: CampaignCheckpoint, progress: Dict, seq: int):
+        task = asyncio.create_task(self._run(campaign_id, run, checkpoint, progress, seq))
+        self._tasks[campaign_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(campaign_id, None))
+
+    async def submit(self, kind: str, params: Dict, run: CampaignRunner, upload_sha256: Optional[str] = None) -> str:
+        campaign_id = str(ObjectId())
+        now = datetime.now(timezone.utc)
+        progress = {"processed": 0, "succeeded": 0, "failed": 0, "rejected": 0}
+        await self.db.campaigns.insert_one({
+            "_id": campaign_id,
+            "kind": kind,
+            "params": params,
+            "upload_sha256": upload_sha256,
+            "status": CampaignStatus.QUEUED,
+            "progress": progress,
+            "attempts": 1,
+            "created_at": now,
+            "updated_at": now
+        })
+        self._start(campaign_id, run, CampaignCheckpoint(campaign_id), progress, seq=0)
+        logger.info(f"Submitted {kind} campaign {campaign_id}")
+        return campaign_id
+
+    async def resume(self, campaign_id: str, run: CampaignRunner):
+        """
+        Run a campaign again from its checkpoint.
+
+        Raises ValueError unless the campaign is INTERRUPTED, FAILED, or
+        RUNNING without a heartbeat for `stale_seconds`. The claim is a
+        single conditional update, so concurrent resumes start it once.
+        """
+        if campaign_id in self._tasks:
+            raise ValueError("Campaign is still running")
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=self.stale_seconds)
+        claimed = await self.db.campaigns.update_one(
+            {"_id": campaign_id, "$or": [
+                {"status": {"$in": [CampaignStatus.INTERRUPTED, CampaignStatus.FAILED]}},
+                {"status": {"$in": [CampaignStatus.QUEUED, CampaignStatus.RUNNING]}, "updated_at": {"$lt": stale_before}}
+            ]},
+            {"$set": {"status": CampaignStatus.QUEUED, "updated_at": datetime.now(timezone.utc)}, "$inc": {"attempts": 1}}
+        )
+        if claimed.matched_count == 0:
+            raise ValueError("Only interrupted, failed or stalled campaigns can be resumed")
+
+        # One pass over this campaign's results; every row is then an O(1) set lookup
+        done: Set[str] = set()
+        seq = 0
+        async for result in self.db.campaign_results.find(
+            {"campaign_id": campaign_id, "row_key": {"$exists": True}},
+            {"_id": 0, "row_key": 1, "seq": 1}
+        ):
+            done.add(result["row_key"])
+            seq = max(seq, result["seq"])
+
+        # Failed rows are retried, so their earlier results and counts are dropped
+        await self.db.campaign_results.delete_many({"campaign_id": campaign_id, "row_key": {"$exists": False}})
+        progress = {"processed": len(done), "succeeded": len(done), "failed": 0, "rejected": 0}
+        await self._set(campaign_id, {"progress": progress, "resumed_from": len(done)})
+
+        self._start(campaign_id, run, CampaignCheckpoint(campaign_id, done=done), progress, seq)
+        logger.info(f"Resumed campaign {campaign_id}, {len(done)} rows already sent")
+
+    async def _set(self, campaign_id: str, fields: Dict):
+        fields["updated_at"] = datetime.now(timezone.utc)
+        await self.db.campaigns.update_one({"_id": campaign_id}, {"$set": fields})
+
+    async def _run(self, campaign_id: str, run: CampaignRunner, checkpoint: CampaignCheckpoint, progress: Dict, seq: int):
+        recorder = CampaignRecorder(
+            self.db,
+            campaign_id,
+            batch_size=self.results_batch_size,
+            seq=seq,
+            totals={key: progress[key] for key in ("succeeded", "failed", "rejected")}
+        )
+        recorder.start()
+        await self._set(campaign_id, {"status": CampaignStatus.RUNNING, "started_at": datetime.now(timezone.utc)})
+        self.feed.open(
+            campaign_id,
+            snapshot=lambda: {"status": CampaignStatus.RUNNING, **recorder.snapshot()},
+            version=lambda: recorder.seq
+        )
+
+        final = {}
+        try:
+            summary = await run(campaign_id, checkpoint.wrap(recorder.record), checkpoint)
+            for rejection in summary.get("rejected", {}).get("rows", []):
+                recorder.record({"status": "rejected", **rejection})
+            final = {"status": CampaignStatus.COMPLETED, "skipped": summary.get("skipped")}
+        except asyncio.CancelledError:
+            final = {"status": CampaignStatus.INTERRUPTED}
+            raise
+        except Exception as e:
+            logger.error(f"Campaign {campaign_id} failed: {str(e)}")
+            final = {"status": CampaignStatus.FAILED, "error": getattr(e, "detail", None) or str(e)}
+        finally:
+            try:
+                await recorder.close()
+            except Exception as e:
+                # The final status is still written, so the campaign doesn't look alive until
+                # it goes stale; unwritten results are sent again if it is resumed
+                logger.error(f"Campaign {campaign_id} could not write its last results: {str(e)}")
+                if final.get("status") == CampaignStatus.COMPLETED:
+                    final = {"status": CampaignStatus.FAILED, "error": f"Could not write results: {str(e)}"}
+            final["finished_at"] = datetime.now(timezone.utc)
+            try:
+                await self._set(campaign_id, final)
+            finally:
+                await self.feed.close(campaign_id, {"status": final["status"], **recorder.snapshot()})
+            logger.info(f"Campaign {campaign_id} finished with status {final['status']}")
+
+    async def get(self, campaign_id: str) -> Optional[Dict]:
+        return await self.db.campaigns.find_one({"_id": campaign_id})
+
+    async def get_results(self, campaign_id: str, after: int = 0, limit: int = 100) -> List[Dict]:
+        """Results with seq greater than `after`, in seq order"""
+        cursor = self.db.campaign_results.find(
+            {"campaign_id": campaign_id, "seq": {"$gt": after}},
+            {"_id": 0, "campaign_id": 0}
+        ).sort("seq", 1).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def iter_results(self, campaign_id: str) -> AsyncIterator[Dict]:
+        cursor = self.db.campaign_results.find(
+            {"campaign_id": campaign_id},
+            {"_id": 0, "campaign_id": 0}
+        ).sort("seq", 1)
+        async for result in cursor:
+            yield result
+
+    async def shutdown(self):
+        """Cancel running campaigns; they are marked INTERRUPTED"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
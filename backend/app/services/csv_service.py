@@ -1,7 +1,8 @@
-import pandas as pd
-from io import StringIO
-from typing import List, Dict, Optional
+import csv
+import io
+from typing import BinaryIO, Dict, Iterable, Iterator, List
 from pydantic import BaseModel
+from app.services.template_engine import CompiledTemplate
 
 class TemplateData(BaseModel):
     template: str
@@ -10,40 +11,77 @@ class TemplateData(BaseModel):
 
 class CSVService:
     @staticmethod
-    async def process_csv(file_contents: str, template_data: TemplateData) -> List[Dict]:
-        df = pd.read_csv(StringIO(file_contents))
+    def get_placeholder_columns(template_data: TemplateData) -> List[str]:
+        return [col.strip() for col in template_data.placeholder_columns.split(",")]
 
-        # Validate all required placeholder columns exist
-        available_columns = list(df.columns)
-        print(available_columns)
-        df = pd.read_csv(StringIO(file_contents))
+    @staticmethod
+    def open_csv_stream(file: BinaryIO, encoding: str = 'utf-8') -> csv.DictReader:
+        """
+        Read CSV rows lazily from a binary file, e.g. UploadFile.file.
+
+        The file is decoded in buffered chunks, so only the current row is
+        held in memory no matter how large the upload is.
+        """
+        text_stream = io.TextIOWrapper(file, encoding=encoding, newline='')
+        return csv.DictReader(text_stream)
+
+    @staticmethod
+    def check_csv_stream(file: BinaryIO, encoding: str = 'utf-8'):
+        """
+        Decode and parse the whole file once, then rewind it.
+
+        Sends read the file lazily, so a bad byte or malformed row would
+        otherwise only surface after the rows before it were sent. Raises
+        ValueError on the first problem.
+        """
+        text_stream = io.TextIOWrapper(file, encoding=encoding, newline='')
+        reader = csv.reader(text_stream)
+        try:
+            for _ in reader:
+                pass
+        except UnicodeDecodeError as e:
+            raise ValueError(f"CSV is not valid {encoding}: {str(e)}") from e
+        except csv.Error as e:
+            raise ValueError(f"CSV line {reader.line_num} could not be parsed: {str(e)}") from e
+        finally:
+            # Leave the caller's file open
+            text_stream.detach()
+        file.seek(0)
 
-    # Validate all required placeholder columns exist
-        available_columns = list(df.columns)
-        placeholder_columns = [col.strip() for col in template_data.placeholder_columns.split(",")]
+    @staticmethod
+    def validate_columns(reader: csv.DictReader, template_data: TemplateData) -> List[str]:
+        """Check the CSV header has every placeholder column and return them"""
+        available_columns = reader.fieldnames or []
+        placeholder_columns = CSVService.get_placeholder_columns(template_data)
 
-        print(placeholder_columns)
         missing_columns = [col for col in placeholder_columns if col not in available_columns]
-        print(missing_columns)
         if missing_columns:
             raise ValueError(f"CSV is missing required columns for template: {', '.join(missing_columns)}")
+        return placeholder_columns
 
-        # For each row, create a mapping of placeholders to values
-        processed_rows = []
-        for _, row in df.iterrows():
-            template_mapping = {col: str(row[col]) for col in placeholder_columns}
-            email_body = template_data.template
-            email_subject = template_data.subject_template
+    @staticmethod
+    def render_rows(
+        rows: Iterable[Dict],
+        template_data: TemplateData,
+        placeholder_columns: List[str]
+    ) -> Iterator[Dict]:
+        """
+        Lazily add the rendered body and subject to each row.
 
-            for placeholder, value in template_mapping.items():
-                email_body = email_body.replace(f"{{{placeholder}}}", value)
-                email_subject = email_subject.replace(f"{{{placeholder}}}", value)
+        Args:
+            rows: CSV rows, e.g. after recipient validation and filtering
+            template_data: Body/subject templates
+            placeholder_columns: Columns checked by `validate_columns`
+        """
+        # Templates are compiled once; each row is then a single join per template
+        body_template = CompiledTemplate(template_data.template, placeholder_columns)
+        subject_template = CompiledTemplate(template_data.subject_template, placeholder_columns)
 
-            processed_rows.append({
-                "email_content": email_body,
-                "email_subject": email_subject,
+        for row in rows:
+            template_mapping = {col: str(row[col]) for col in placeholder_columns}
+            yield {
+                "email_content": body_template.render(template_mapping),
+                "email_subject": subject_template.render(template_mapping),
                 "template_data": template_mapping,
-                **row.to_dict()
-            })
-
-        return processed_rows
\ No newline at end of file
+                **row
+            }
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BulkDispatcher:
+    """Fans out per-row work across a bounded pool of asyncio workers"""
+
+    def __init__(self, concurrency: int = 10):
+        self.concurrency = max(1, concurrency)
+
+    async def dispatch(
+        self,
+        items: Iterable[Any],
+        handler: Callable[[Any], Awaitable[Dict]],
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Run `handler` for every item and return the results in input order.
+
+        Items are pulled lazily through a bounded queue, so at most a few
+        multiples of `concurrency` rows are in flight at any time.
+
+        Args:
+            items: Rows to process
+            handler: Coroutine function producing the result dict for one row
+            on_result: Receives each result as soon as it is ready instead of
+                collecting it; an empty list is then returned
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: Dict[int, Dict] = {}
+
+        async def producer():
+            try:
+                for index, item in enumerate(items):
+                    await queue.put((index, item))
+            finally:
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+        async def worker():
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    return
+                index, item = entry
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    logger.error(f"Dispatch handler failed for item {index}: {str(e)}")
+                    result = {'status': 'error', 'error': str(e)}
+                if on_result:
+                    on_result(result)
+                else:
+                    results[index] = result
+
+        await asyncio.gather(producer(), *(worker() for _ in range(self.concurrency)))
+        return [results[index] for index in range(len(results))]
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.services.analytics_rollup import AnalyticsRollup
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class EmailRecordWriter:
+    """
+    Write-behind buffer for email records and their status transitions.
+
+    Records get their ObjectId up front and are flushed with insert_many;
+    status updates are flushed with an unordered bulk_write. An update to a
+    record that is still buffered is merged into it, so a PENDING insert
+    followed by a SENT update usually costs a single document write.
+    Flushes happen when `batch_size` writes are buffered or every
+    `flush_interval` seconds, and `close` drains everything on shutdown.
+
+    Status transitions are also counted in the analytics rollup, whose
+    counters are flushed together with the records.
+    """
+
+    def __init__(
+        self,
+        db,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        rollup: Optional[AnalyticsRollup] = None
+    ):
+        self.db = db
+        self.rollup = rollup
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self._inserts: Dict[ObjectId, Dict] = {}
+        self._updates: Dict[ObjectId, Dict] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._inserts) + len(self._updates)
+
+    def start(self):
+        """Start the background flush loop; also done lazily on the first write"""
+        if self._task is None and not self._closed:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _after_write(self):
+        self.start()
+        if self.pending_count >= self.batch_size:
+            self._wakeup.set()
+        # Apply backpressure if MongoDB falls behind
+        if self.pending_count >= self.batch_size * 10:
+            await self.flush()
+
+    async def insert(self, record: Dict) -> ObjectId:
+        """Buffer a new email record and return its _id"""
+        record.setdefault("_id", ObjectId())
+        self._inserts[record["_id"]] = record
+        if self.rollup:
+            self.rollup.record_insert(record)
+        await self._after_write()
+        return record["_id"]
+
+    async def update(self, email_id: ObjectId, fields: Dict, previous_status: Optional[str] = None):
+        """
+        Buffer a $set of `fields` on an email record.
+
+        When `fields` changes the status of a record that is no longer
+        buffered, pass its `previous_status` so the rollup stays accurate.
+        """
+        if email_id in self._inserts:
+            previous_status = self._inserts[email_id]["status"]
+            self._inserts[email_id].update(fields)
+        else:
+            self._updates.setdefault(email_id, {}).update(fields)
+        if self.rollup and "status" in fields:
+            self.rollup.record_transition(previous_status, fields["status"], datetime.now(timezone.utc))
+        await self._after_write()
+
+    def get_pending(self, email_id: ObjectId) -> Optional[Dict]:
+        """Return the buffered view of a record that hasn't been flushed yet"""
+        record = self._inserts.get(email_id)
+        if record is None and email_id in self._updates:
+            return {"_id": email_id, **self._updates[email_id]}
+        return record
+
+    async def _flush_loop(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Email record flush failed, will retry: {str(e)}")
+
+    async def flush(self):
+        """Write all buffered records and updates to MongoDB"""
+        async with self._flush_lock:
+            await self._flush()
+
+    async def rebuild_rollup(self) -> Dict:
+        """
+        Recompute the rollup totals from the emails collection.
+
+        Buffered records and pending rollup deltas are written first, and no
+        flush can run until the totals are replaced, so deltas already in
+        the aggregate aren't applied on top of it again.
+        """
+        async with self._flush_lock:
+            await self._flush()
+            return await self.rollup.rebuild()
+
+    async def _flush(self):
+        inserts, self._inserts = self._inserts, {}
+        updates, self._updates = self._updates, {}
+
+        if inserts:
+            try:
+                await self.db.emails.insert_many(list(inserts.values()), ordered=False)
+            except BulkWriteError as e:
+                # Duplicates come from a retried flush that partially succeeded
+                failed = [
+                    error for error in e.details.get("writeErrors", [])
+                    if error.get("code") != DUPLICATE_KEY_ERROR
+                ]
+                self._requeue_inserts([list(inserts.values())[error["index"]] for error in failed])
+                self._requeue_updates(updates)
+                if failed:
+                    raise
+            except Exception:
+                self._requeue_inserts(list(inserts.values()))
+                self._requeue_updates(updates)
+                raise
+
+        if updates:
+            email_ids = list(updates.keys())
+            operations = [UpdateOne({"_id": email_id}, {"$set": updates[email_id]}) for email_id in email_ids]
+            try:
+                await self.db.emails.bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                failed_ids = {email_ids[error["index"]] for error in e.details.get("writeErrors", [])}
+                self._requeue_updates({email_id: updates[email_id] for email_id in failed_ids})
+                raise
+            except Exception:
+                self._requeue_updates(updates)
+                raise
+
+        if self.rollup:
+            await self.rollup.flush()
+
+        if inserts or updates:
+            logger.debug(f"Flushed {len(inserts)} email inserts and {len(updates)} updates")
+
+    def _requeue_inserts(self, records: List[Dict]):
+        for record in records:
+            # Newer updates buffered since the flush started take precedence
+            record.update(self._updates.pop(record["_id"], {}))
+            self._inserts[record["_id"]] = record
+
+    def _requeue_updates(self, updates: Dict[ObjectId, Dict]):
+        for email_id, fields in updates.items():
+            merged = {**fields, **self._updates.get(email_id, {})}
+            if email_id in self._inserts:
+                self._inserts[email_id].update(merged)
+            else:
+                self._updates[email_id] = merged
+
+    async def close(self):
+        """Stop the background loop and flush everything still buffered"""
+        self._closed = True
+        if self._task:
+            # Let the loop finish its current flush rather than cancelling it mid-write
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                logger.error(f"Final email record flush attempt {attempt} failed: {str(e)}")
+                await asyncio.sleep(attempt)
+        logger.critical(f"{self.pending_count} email records could not be written on shutdown")
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import random
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LLMRetryableError(Exception):
+    """Transient provider failure (rate limiting, 5xx, timeouts) worth retrying"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class OpenRouterProvider:
+    """Chat completions over a persistent keep-alive httpx connection pool"""
+
+    def __init__(self, api_key: str, model: str, timeout: float, max_connections: int):
+        self.model = model
+        self.client = httpx.AsyncClient(
+            base_url="https://openrouter.ai/api/v1",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "HTTP-Referer": "http://localhost:3000",
+                "X-Title": "Email Sender App"
+            },
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    async def complete(self, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+        try:
+            response = await self.client.post(
+                "/chat/completions",
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens
+                }
+            )
+        except httpx.TimeoutException as e:
+            raise LLMRetryableError(f"LLM request timed out: {str(e)}")
+        except httpx.TransportError as e:
+            raise LLMRetryableError(f"LLM connection failed: {str(e)}")
+
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = response.headers.get("Retry-After")
+            raise LLMRetryableError(
+                f"LLM returned HTTP {response.status_code}",
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+            )
+        response.raise_for_status()
+
+        return response.json()['choices'][0]['message']['content']
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class StubLLMProvider:
+    """Local provider returning a canned email after `latency` seconds, for load tests"""
+
+    def __init__(self, latency: float = 0.5):
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, messages: List[Dict], temperature: float, max_tokens: int) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return json.dumps({
+            "subject": "A quick update for you",
+            "html_body": "<p>Hello,</p><p>Thanks for being with us. Here is a quick update.</p>",
+            "text_body": "Hello,\\n\\nThanks for being with us. Here is a quick update."
+        })
+
+    async def close(self):
+        pass
+
+
+class LLMClient:
+    """
+    Async LLM client shared by the process.
+
+    Limits in-flight requests with a semaphore and retries transient
+    failures with exponential backoff and jitter.
+    """
+
+    def __init__(self, provider, max_concurrency: int = 4, max_retries: int = 3, backoff_base: float = 1.0):
+        self.provider = provider
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete(self, messages: List[Dict], temperature: float = 0.0, max_tokens: int = 1000) -> str:
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    return await self.provider.complete(messages, temperature, max_tokens)
+            except LLMRetryableError as e:
+                if attempt >= self.max_retries:
+                    raise ValueError(f"API request failed after {attempt + 1} attempts: {str(e)}")
+                delay = e.retry_after or self.backoff_base * (2 ** attempt)
+                delay += random.uniform(0, delay / 2)
+                logger.warning(f"{str(e)}; retrying in {delay:.1f}s")
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def close(self):
+        await self.provider.close()
+
+
+_client: Optional[LLMClient] = None
+
+
+def create_llm_client(settings: Settings) -> LLMClient:
+    """Build the client for LLM_PROVIDER ('openrouter' or 'stub')"""
+    if settings.LLM_PROVIDER == "stub":
+        provider = StubLLMProvider(latency=settings.LLM_STUB_LATENCY_MS / 1000)
+    else:
+        provider = OpenRouterProvider(
+            api_key=settings.OPENROUTER_API_KEY,
+            model=settings.LLM_MODEL,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_connections=settings.LLM_MAX_CONCURRENCY
+        )
+    return LLMClient(
+        provider,
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_retries=settings.LLM_MAX_RETRIES
+    )
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        _client = create_llm_client(settings)
+    return _client
+
+
+async def close_llm_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -1,7 +1,7 @@
-import requests
+import httpx
 import json
 from typing import Dict, List
-from ..config import settings
+from .llm_client import get_llm_client
 import re
 
 async def generate_email_content(
@@ -32,52 +32,70 @@ KEY POINTS TO INCLUDE:
 AVAILABLE PERSONALIZATION VARIABLES:
 {', '.join(variable_list)}
 """
+    return await _request_email_content(prompt_template)
 
+async def generate_email_template(
+    situation: str,
+    keywords: List[str],
+    columns: List[str]
+) -> Dict[str, str]:
+    """
+    Generate a reusable email template whose {Column} placeholders are
+    filled in per recipient, so one LLM call serves a whole CSV file
+    
+    Args:
+        situation: str: The email context/purpose
+        keywords: List[str]: Key points to include
+        columns: List[str]: CSV columns available as placeholders
+    Returns:
+        Dict[str, str]: Dictionary containing email subject, html_body, and text_body templates
+    """
+    prompt_template = f"""
+SITUATION:
+{situation}
+
+KEY POINTS TO INCLUDE:
+{', '.join(keywords)}
+
+AVAILABLE PERSONALIZATION VARIABLES:
+{', '.join(f"{{{column}}}" for column in columns)}
+
+Write the variables exactly as listed, including the curly braces. They are replaced with each recipient's values after generation.
+"""
+    return await _request_email_content(prompt_template)
+
+async def _request_email_content(prompt_template: str) -> Dict[str, str]:
+    """Send the prompt to the LLM and parse the email JSON it returns"""
     try:
-        # Make the API call
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-                "HTTP-Referer": "http://localhost:3000",
-                "X-Title": "Email Sender App"
-            },
-            json={
-                "model": "meta-llama/llama-3.2-3b-instruct:free",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": '''
-                        You are a professional email writer. Create emails that are clear, concise, and appropriate for the given situation. 
-                        Return your response as a valid JSON object with the following structure:
-                        {
-                            "subject": "The email subject line",
-                            "html_body": "The HTML formatted email body",
-                            "text_body": "The plain text email body"
-                        }
-                        
-                        Important:
-                        - Use only the variables provided in AVAILABLE PERSONALIZATION VARIABLES
-                        - Keep all newlines as literal '\\n' in the text_body
-                        - Ensure HTML is properly formatted in html_body
-                        - Return only the JSON object, no markdown formatting or code blocks
-                        '''
-                    },
+        # Make the API call through the shared async client
+        content = await get_llm_client().complete(
+            messages=[
+                {
+                    "role": "system",
+                    "content": '''
+                    You are a professional email writer. Create emails that are clear, concise, and appropriate for the given situation. 
+                    Return your response as a valid JSON object with the following structure:
                     {
-                        "role": "user",
-                        "content": prompt_template
+                        "subject": "The email subject line",
+                        "html_body": "The HTML formatted email body",
+                        "text_body": "The plain text email body"
                     }
-                ],
-                "temperature": 0.0,
-                "max_tokens": 1000
-            }
+                
+                    Important:
+                    - Use only the variables provided in AVAILABLE PERSONALIZATION VARIABLES
+                    - Keep all newlines as literal '\\n' in the text_body
+                    - Ensure HTML is properly formatted in html_body
+                    - Return only the JSON object, no markdown formatting or code blocks
+                    '''
+                },
+                {
+                    "role": "user",
+                    "content": prompt_template
+                }
+            ],
+            temperature=0.0,
+            max_tokens=1000
         )
-
-        # Parse the API response
-        llm_response = response.json()
-        
-        # Get the content
-        content = llm_response['choices'][0]['message']['content']
         
         # Print raw content for debugging
         print("Raw content received:", content)
@@ -118,7 +136,7 @@ AVAILABLE PERSONALIZATION VARIABLES:
             print(f"Content that failed to parse: {content}")
             raise ValueError(f"Failed to parse JSON content: {str(e)}")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         raise ValueError(f"API request failed: {str(e)}")
     except KeyError as e:
         raise ValueError(f"Invalid response structure: {str(e)}")
@@ -0,0 +1,114 @@
+import base64
+import uuid
+from email.header import Header
+from email.utils import formataddr, parseaddr
+from typing import Dict, List, Optional, Union
+
+from app.services.template_engine import CompiledTemplate
+
+CRLF = b"\r\n"
+
+
+def _encode_header(value: str) -> bytes:
+    """Plain ASCII headers go out as-is, anything else as an RFC 2047 word"""
+    if "\r" in value or "\n" in value:
+        raise ValueError("Header values must not contain line breaks")
+    if value.isascii():
+        return value.encode('ascii')
+    return Header(value, 'utf-8').encode(linesep='\r\n').encode('ascii')
+
+
+def _encode_body(text: str) -> bytes:
+    # encodebytes wraps at 76 characters with \n; SMTP wants \r\n
+    return base64.encodebytes(text.encode('utf-8')).replace(b"\n", CRLF)
+
+
+class _Part:
+    """A subject or body that is either pre-encoded once or templated per message"""
+
+    def __init__(self, template: Union[str, CompiledTemplate], placeholders: List[str], encoder):
+        if isinstance(template, str):
+            template = CompiledTemplate(template, placeholders)
+        self.template = template
+        self.encoder = encoder
+        self.static: Optional[bytes] = None if template.fields else encoder(template.render({}))
+
+    def render(self, mapping: Dict[str, str]) -> str:
+        return self.template.render(mapping) if self.template.fields else self.template.template
+
+    def encode(self, rendered: str) -> bytes:
+        return self.static if self.static is not None else self.encoder(rendered)
+
+
+class RawMessageTemplate:
+    """
+    A MIME message skeleton built once per campaign for SES SendRawEmail.
+
+    Headers, multipart boundaries and any part without placeholders are
+    encoded up front; `render` only encodes the To header, the subject and
+    the templated bodies of one recipient and joins the pre-built chunks.
+    """
+
+    def __init__(
+        self,
+        sender: str,
+        subject_template: Union[str, CompiledTemplate],
+        html_template: Union[str, CompiledTemplate],
+        text_template: Union[str, CompiledTemplate, None] = None,
+        placeholders: Optional[List[str]] = None
+    ):
+        placeholders = placeholders or []
+        self.subject = _Part(subject_template, placeholders, _encode_header)
+        self.html = _Part(html_template, placeholders, _encode_body)
+        self.text = _Part(text_template, placeholders, _encode_body) if text_template is not None else None
+
+        name, address = parseaddr(sender)
+        self.sender = address
+        self._from = b"From: " + _encode_header(formataddr((name, address)) if name else address) + CRLF
+
+        html_headers = (b"Content-Type: text/html; charset=\"utf-8\"" + CRLF +
+                        b"Content-Transfer-Encoding: base64" + CRLF + CRLF)
+        if self.text is None:
+            self._mime_headers = b"MIME-Version: 1.0" + CRLF + html_headers
+            self._text_headers = b""
+            self._html_headers = b""
+            self._closing = b""
+        else:
+            boundary = f"=_{uuid.uuid4().hex}".encode('ascii')
+            self._mime_headers = (b"MIME-Version: 1.0" + CRLF +
+                                  b"Content-Type: multipart/alternative; boundary=\"" + boundary + b"\"" + CRLF +
+                                  CRLF)
+            self._text_headers = (b"--" + boundary + CRLF +
+                                  b"Content-Type: text/plain; charset=\"utf-8\"" + CRLF +
+                                  b"Content-Transfer-Encoding: base64" + CRLF + CRLF)
+            self._html_headers = b"--" + boundary + CRLF + html_headers
+            self._closing = b"--" + boundary + b"--" + CRLF
+
+    def render_parts(self, mapping: Dict[str, str]) -> Dict[str, Optional[str]]:
+        """The subject and bodies for one recipient, as stored on email records"""
+        return {
+            "subject": self.subject.render(mapping),
+            "body_html": self.html.render(mapping),
+            "body_text": self.text.render(mapping) if self.text else None
+        }
+
+    def render(self, recipient: str, mapping: Optional[Dict[str, str]] = None, parts: Optional[Dict] = None) -> bytes:
+        """
+        Build the raw message for one recipient.
+
+        Args:
+            recipient: To address
+            mapping: Placeholder values for this recipient
+            parts: Output of `render_parts`, to avoid rendering twice
+        """
+        parts = parts or self.render_parts(mapping or {})
+        chunks = [
+            self._from,
+            b"To: ", _encode_header(recipient), CRLF,
+            b"Subject: ", self.subject.encode(parts["subject"]), CRLF,
+            self._mime_headers
+        ]
+        if self.text is not None:
+            chunks += [self._text_headers, self.text.encode(parts["body_text"]), self._html_headers]
+        chunks += [self.html.encode(parts["body_html"]), self._closing]
+        return b"".join(chunks)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class PipelineStage:
+    """One step of a Pipeline, run by its own pool of workers"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        queue_size: int = 100
+    ):
+        """
+        Args:
+            name: Stage name used in metrics
+            handler: Coroutine function turning an item into the next stage's input
+            workers: Number of concurrent workers for this stage
+            queue_size: Capacity of the queue feeding this stage
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def metrics(self, elapsed: float) -> Dict:
+        completed = self.processed + self.failed
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput_per_second": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+            "avg_latency_ms": round(self.busy_seconds / completed * 1000, 2) if completed else 0.0,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_size": self.queue_size
+        }
+
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+
+    Every stage has its own worker pool, so slow stages (e.g. LLM calls)
+    overlap with the others instead of adding up, and the bounded queues
+    keep a fast producer from running ahead of the slowest stage.
+    """
+
+    def __init__(
+        self,
+        stages: List[PipelineStage],
+        on_error: Optional[Callable[[Any, str, Exception], None]] = None
+    ):
+        """
+        Args:
+            stages: Stages in processing order
+            on_error: Called with (item, stage name, exception) when a handler
+                raises; the item is then dropped from later stages.
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.perf_counter()) - self._started
+
+    def metrics(self) -> Dict:
+        """Per-stage throughput and queue depth; safe to call while running"""
+        elapsed = self.elapsed
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "stages": {stage.name: stage.metrics(elapsed) for stage in self.stages}
+        }
+
+    async def _work(self, stage: PipelineStage, next_stage: Optional[PipelineStage]):
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                return
+            stage.max_queue_depth = max(stage.max_queue_depth, stage.queue.qsize() + 1)
+
+            started = time.perf_counter()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                stage.failed += 1
+                if self.on_error:
+                    self.on_error(item, stage.name, e)
+                else:
+                    logger.error(f"Pipeline stage {stage.name} failed: {str(e)}")
+                continue
+            finally:
+                stage.busy_seconds += time.perf_counter() - started
+
+            stage.processed += 1
+            if next_stage is not None and result is not None:
+                await next_stage.queue.put(result)
+
+    async def _run_stage(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        await asyncio.gather(*(self._work(stage, next_stage) for _ in range(stage.workers)))
+        if next_stage is not None:
+            for _ in range(next_stage.workers):
+                await next_stage.queue.put(_DONE)
+
+    async def _feed(self, items: Iterable[Any]):
+        first = self.stages[0]
+        try:
+            for item in items:
+                await first.queue.put(item)
+        finally:
+            for _ in range(first.workers):
+                await first.queue.put(_DONE)
+
+    async def run(self, items: Iterable[Any]):
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+        self._started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                self._feed(items),
+                *(self._run_stage(index) for index in range(len(self.stages)))
+            )
+        finally:
+            self._finished = time.perf_counter()
+        logger.info(f"Pipeline finished: {self.metrics()}")
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+class _Subscription:
+    """Holds only the newest undelivered event, so slow readers skip stale ones"""
+
+    def __init__(self):
+        self.latest: Optional[Dict] = None
+        self.ended = False
+        self._ready = asyncio.Event()
+
+    def offer(self, event: Dict):
+        self.latest = event
+        self._ready.set()
+
+    def end(self):
+        self.ended = True
+        self._ready.set()
+
+    async def next(self, timeout: float):
+        """The newest event, or _END once ended; raises TimeoutError when idle"""
+        if self.latest is None and not self.ended:
+            self._ready.clear()
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        if self.latest is not None:
+            event, self.latest = self.latest, None
+            return event
+        return _END
+
+
+class _Channel:
+    def __init__(self, snapshot: Callable[[], Dict], version: Callable[[], Any]):
+        self.snapshot = snapshot
+        self.version = version
+        self.subscribers: List[_Subscription] = []
+        self.last_version: Any = None
+        self.task: Optional[asyncio.Task] = None
+
+    def fan_out(self, event):
+        for subscriber in self.subscribers:
+            subscriber.offer(event)
+
+
+class ProgressFeed:
+    """
+    In-process pub/sub for live campaign progress.
+
+    Senders never publish per row: a campaign registers a `snapshot`
+    callable over counters it already keeps plus a cheap `version` that
+    changes with them. One ticker per campaign checks the version at most
+    `max_events_per_second` times and fans out a snapshot only when it
+    moved, so the send loop's cost is independent of the number of
+    subscribers and of the send rate.
+    """
+
+    def __init__(self, max_events_per_second: float = 4.0):
+        self.interval = 1.0 / max(max_events_per_second, 0.1)
+        self._channels: Dict[str, _Channel] = {}
+
+    def is_live(self, campaign_id: str) -> bool:
+        return campaign_id in self._channels
+
+    def open(self, campaign_id: str, snapshot: Callable[[], Dict], version: Callable[[], Any]):
+        channel = _Channel(snapshot, version)
+        self._channels[campaign_id] = channel
+        channel.task = asyncio.create_task(self._tick(channel))
+
+    async def _tick(self, channel: _Channel):
+        while True:
+            await asyncio.sleep(self.interval)
+            version = channel.version()
+            if version != channel.last_version and channel.subscribers:
+                channel.last_version = version
+                channel.fan_out(channel.snapshot())
+
+    async def close(self, campaign_id: str, final: Dict):
+        """Publish the final snapshot and end every subscription"""
+        channel = self._channels.pop(campaign_id, None)
+        if channel is None:
+            return
+        channel.task.cancel()
+        try:
+            await channel.task
+        except asyncio.CancelledError:
+            pass
+        # Subscribers still receive the final snapshot before the end marker
+        for subscriber in channel.subscribers:
+            subscriber.offer(final)
+            subscriber.end()
+
+    async def subscribe(self, campaign_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict]]:
+        """
+        Yield progress snapshots until the campaign closes.
+
+        Yields None after `heartbeat` seconds without an event so callers can
+        keep idle connections alive.
+        """
+        channel = self._channels.get(campaign_id)
+        if channel is None:
+            return
+        subscription = _Subscription()
+        channel.subscribers.append(subscription)
+        try:
+            yield channel.snapshot()
+            while True:
+                try:
+                    event = await subscription.next(heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is _END:
+                    return
+                yield event
+        finally:
+            if subscription in channel.subscribers:
+                channel.subscribers.remove(subscription)
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Async token bucket that limits how many operations start per second"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, min_capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second. A rate of 0 or less disables limiting.
+            capacity: Maximum burst size. Defaults to one second worth of tokens,
+                but at least `min_capacity`, and then follows `set_rate`.
+            min_capacity: Smallest default capacity; must cover the largest
+                single `acquire`.
+        """
+        self.rate = rate
+        self.min_capacity = min_capacity
+        self._fixed_capacity = capacity
+        self.capacity = capacity if capacity is not None else max(rate, min_capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        """Change the refill rate; tokens accrued at the old rate are kept"""
+        self._refill()
+        self.rate = rate
+        if self._fixed_capacity is None:
+            self.capacity = max(rate, self.min_capacity)
+            self._tokens = min(self._tokens, self.capacity)
+
+    async def acquire(self, tokens: float = 1.0):
+        """
+        Wait until `tokens` are available and consume them. Raises
+        ValueError if `tokens` exceeds the capacity, which no wait could fill.
+        """
+        if self.rate <= 0:
+            return
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+
+        # Waiters queue up on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """
+    Token bucket whose rate adapts to throttling (AIMD).
+
+    Every successful send adds about `increase` tokens/s per second of
+    sending, up to `max_rate` (the account quota). A throttling error
+    multiplies the rate by `decrease_factor`, at most once per `cooldown`
+    seconds so that the burst of requests already in flight when the first
+    error comes back only counts once, and drops the burst allowance.
+    """
+
+    def __init__(
+        self,
+        max_rate: float,
+        min_rate: float = 1.0,
+        increase: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        cooldown: float = 0.5,
+        min_capacity: float = 1.0
+    ):
+        super().__init__(max_rate, min_capacity=min_capacity)
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.increase = increase if increase else max(max_rate / 100, 1.0)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.throttles = 0
+        self._last_decrease = float("-inf")
+
+    def record_success(self, cost: float = 1.0):
+        if self.rate < self.max_rate:
+            # `cost / rate` seconds of sending at the current rate
+            self.set_rate(min(self.max_rate, self.rate + self.increase * cost / self.rate))
+
+    def record_throttle(self):
+        self.throttles += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.set_rate(max(self.min_rate, self.rate * self.decrease_factor))
+        self._tokens = min(self._tokens, 0.0)
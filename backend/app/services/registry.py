@@ -0,0 +1,123 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.config import settings
+from app.database import Database
+from app.services.analytics_rollup import AnalyticsRollup
+from app.services.campaign_service import CampaignJobManager
+from app.services.progress_feed import ProgressFeed
+from app.services.email_writer import EmailRecordWriter
+from app.services.llm_client import close_llm_client
+from app.services.scheduler_service import EmailScheduler
+from app.services.ses_service import SESService
+from app.services.ses_shards import SESShardPool, create_ses_shard_pool
+from app.services.ses_stats_cache import SESStatisticsCache
+from app.services.ses_transport import SESTransport
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Process-wide service instances, created on startup and released on shutdown"""
+    shards: Optional[SESShardPool] = None
+    transport: Optional[SESTransport] = None
+    writer: Optional[EmailRecordWriter] = None
+    ses_service: Optional[SESService] = None
+    scheduler: Optional[EmailScheduler] = None
+    stats_cache: Optional[SESStatisticsCache] = None
+    campaigns: Optional[CampaignJobManager] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    async def startup(cls):
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls.ses_service is not None:
+                return
+            db = await Database.get_db()
+            cls.shards = create_ses_shard_pool(settings)
+            cls.transport = cls.shards.primary.transport
+            rollup = AnalyticsRollup(db)
+            # Seed the totals from existing emails before any increments land
+            await rollup.get_totals()
+            cls.writer = EmailRecordWriter(
+                db,
+                batch_size=settings.EMAIL_WRITE_BATCH_SIZE,
+                flush_interval=settings.EMAIL_WRITE_FLUSH_INTERVAL_SECONDS,
+                rollup=rollup
+            )
+            # Started eagerly so scheduler-thread rollup counts are flushed too
+            cls.writer.start()
+            cls.ses_service = SESService(
+                settings,
+                db,
+                transport=cls.transport,
+                writer=cls.writer,
+                rollup=rollup,
+                shards=cls.shards
+            )
+            cls.scheduler = EmailScheduler(
+                cls.ses_service,
+                workers=settings.SCHEDULER_WORKERS,
+                poll_interval=settings.SCHEDULER_POLL_INTERVAL_SECONDS,
+                lease_seconds=settings.SCHEDULER_LEASE_SECONDS
+            )
+            await cls.ses_service.suppressions.load()
+            cls.scheduler.start()
+            cls.stats_cache = SESStatisticsCache(
+                cls.ses_service,
+                ttl=settings.SES_STATS_TTL_SECONDS,
+                refresh_interval=settings.SES_STATS_REFRESH_SECONDS
+            )
+            cls.campaigns = CampaignJobManager(
+                db,
+                results_batch_size=settings.CAMPAIGN_RESULTS_BATCH_SIZE,
+                feed=ProgressFeed(max_events_per_second=settings.CAMPAIGN_PROGRESS_EVENTS_PER_SECOND),
+                stale_seconds=settings.CAMPAIGN_STALE_SECONDS
+            )
+            logger.info("Service registry started")
+
+    @classmethod
+    async def shutdown(cls):
+        if cls.campaigns:
+            # Running campaigns are marked INTERRUPTED before their sends are torn down
+            await cls.campaigns.shutdown()
+        cls.campaigns = None
+        if cls.stats_cache:
+            await cls.stats_cache.stop()
+        cls.stats_cache = None
+        if cls.scheduler:
+            # Let in-flight scheduled sends finish before the transport goes away
+            await asyncio.to_thread(cls.scheduler.stop)
+        cls.scheduler = None
+        if cls.writer:
+            # Drain buffered email records before the database connection closes
+            await cls.writer.close()
+        cls.writer = None
+        if cls.shards:
+            cls.shards.close()
+        cls.shards = None
+        cls.transport = None
+        cls.ses_service = None
+        await close_llm_client()
+        logger.info("Service registry shut down")
+
+    @classmethod
+    async def get_ses_service(cls) -> SESService:
+        if cls.ses_service is None:
+            await cls.startup()
+        return cls.ses_service
+
+    @classmethod
+    async def get_campaign_manager(cls) -> CampaignJobManager:
+        if cls.campaigns is None:
+            await cls.startup()
+        return cls.campaigns
+
+    @classmethod
+    async def get_stats_cache(cls) -> SESStatisticsCache:
+        if cls.stats_cache is None:
+            await cls.startup()
+        return cls.stats_cache
@@ -0,0 +1,232 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from app.database import Database
+from app.models.schemas import EmailStatus
+from app.services.ses_service import SESService
+
+logger = logging.getLogger(__name__)
+
+
+class EmailScheduler:
+    """
+    Sends scheduled emails stored in MongoDB.
+
+    Worker threads claim due emails (status SCHEDULED, scheduled_time <= now)
+    with an atomic find_one_and_update that sets a lease. Any number of
+    processes can run a scheduler against the same database without sending
+    an email twice. Pending emails survive restarts, and a lease left behind
+    by a crashed worker expires so another worker can take the email over.
+
+    Campaign emails scheduled in batches are claimed one email_batches
+    document at a time, so a whole batch is a single job.
+    """
+
+    def __init__(
+        self,
+        ses_service: SESService,
+        workers: int = 2,
+        poll_interval: float = 5.0,
+        lease_seconds: int = 300
+    ):
+        self.ses_service = ses_service
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        self._stop.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"email-scheduler-{index}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Email scheduler {self.worker_id} started with {self.workers} workers")
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        logger.info(f"Email scheduler {self.worker_id} stopped")
+
+    def _lease(self, now: datetime) -> Dict:
+        # Every claim gets its own owner token, so threads of one process can't act on each other's leases
+        return {
+            "lease_owner": f"{self.worker_id}-{uuid.uuid4().hex[:12]}",
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds)
+        }
+
+    def _renew(self, collection, doc_id, lease_owner: str) -> bool:
+        """Atomically extend a lease that is still held; False if it expired or was taken over"""
+        now = datetime.now(timezone.utc)
+        result = collection.update_one(
+            {"_id": doc_id, "lease_owner": lease_owner, "lease_expires_at": {"$gt": now}},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds)}}
+        )
+        return result.matched_count == 1
+
+    def _send_leased(self, database, email_record: Dict) -> Optional[bool]:
+        """
+        Send a leased email once its lease is confirmed still held.
+
+        Returns whether it was sent, or None if the lease was lost and the
+        email left to its new owner.
+        """
+        lease_owner = email_record["lease_owner"]
+        if not self._renew(database.emails, email_record["_id"], lease_owner):
+            logger.warning(f"Lease on email {email_record['_id']} was lost; not sending it")
+            return None
+        return self.ses_service._send_scheduled_email(email_record, lease_owner)
+
+    def _claimable(self, now: datetime) -> Dict:
+        return {
+            "$or": [
+                {"lease_expires_at": None},
+                {"lease_expires_at": {"$lte": now}}
+            ]
+        }
+
+    def claim_next(self, database) -> Optional[Dict]:
+        """Atomically lease the oldest due scheduled email outside a batch, if any"""
+        now = datetime.now(timezone.utc)
+        return database.emails.find_one_and_update(
+            {
+                "status": EmailStatus.SCHEDULED,
+                "scheduled_time": {"$lte": now},
+                "batch_id": None,
+                **self._claimable(now)
+            },
+            {"$set": self._lease(now)},
+            sort=[("scheduled_time", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_next_batch(self, database) -> Optional[Dict]:
+        """Atomically lease the oldest released campaign batch, if any"""
+        now = datetime.now(timezone.utc)
+        return database.email_batches.find_one_and_update(
+            {
+                "status": EmailStatus.SCHEDULED,
+                "release_time": {"$lte": now},
+                **self._claimable(now)
+            },
+            {"$set": self._lease(now)},
+            sort=[("release_time", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    def claim_next_batch_email(self, database, batch_id) -> Optional[Dict]:
+        """Atomically lease the next unsent email of a batch, if any is free"""
+        now = datetime.now(timezone.utc)
+        return database.emails.find_one_and_update(
+            {
+                "batch_id": batch_id,
+                "status": EmailStatus.SCHEDULED,
+                **self._claimable(now)
+            },
+            {"$set": self._lease(now)},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def _send_batch(self, database, batch: Dict):
+        """
+        Send a leased batch one claimed email at a time.
+
+        The batch lease is renewed every third of the lease period, so a
+        batch that takes longer than the lease to send is not taken over;
+        each email is leased on its own, so a worker that does take over
+        can't send one that is in flight. Emails already sent are skipped on
+        retries.
+        """
+        batch_id = batch["_id"]
+        lease_owner = batch["lease_owner"]
+        renewed_at = time.monotonic()
+
+        sent = failed = 0
+        while True:
+            if self._stop.is_set():
+                # Unsent emails are picked up once the batch lease expires
+                return
+            if time.monotonic() - renewed_at >= self.lease_seconds / 3:
+                if not self._renew(database.email_batches, batch_id, lease_owner):
+                    logger.warning(f"Lease on batch {batch_id} was lost; leaving it to its new owner")
+                    return
+                renewed_at = time.monotonic()
+
+            email_record = self.claim_next_batch_email(database, batch_id)
+            if email_record is None:
+                break
+            outcome = self._send_leased(database, email_record)
+            if outcome:
+                sent += 1
+            elif outcome is False:
+                failed += 1
+
+        held = database.emails.find_one(
+            {"batch_id": batch_id, "status": EmailStatus.SCHEDULED},
+            sort=[("lease_expires_at", -1)]
+        )
+        if held is not None:
+            # Some emails are still leased elsewhere, e.g. by a crashed worker:
+            # come back to the batch once their leases have expired
+            database.email_batches.update_one(
+                {"_id": batch_id, "lease_owner": lease_owner},
+                {"$set": {"lease_expires_at": held.get("lease_expires_at") or datetime.now(timezone.utc)}}
+            )
+            return
+
+        database.email_batches.update_one(
+            {"_id": batch_id, "lease_owner": lease_owner},
+            {
+                "$set": {
+                    "status": EmailStatus.SENT,
+                    "sent_count": sent,
+                    "failed_count": failed,
+                    "completed_at": datetime.now(timezone.utc)
+                },
+                "$unset": {"lease_owner": "", "lease_expires_at": ""}
+            }
+        )
+        logger.info(f"Batch {batch.get('batch_index')} of campaign {batch.get('campaign_id')} "
+                    f"done: {sent} sent, {failed} failed")
+
+    def _run(self):
+        while not self._stop.is_set():
+            database = None
+            batch = email_record = None
+            try:
+                database = Database.get_sync_db()
+                batch = self.claim_next_batch(database)
+                if batch is None:
+                    email_record = self.claim_next(database)
+            except Exception as e:
+                logger.error(f"Failed to claim scheduled email: {str(e)}")
+
+            if batch is not None:
+                try:
+                    self._send_batch(database, batch)
+                except Exception as e:
+                    logger.error(f"Error sending batch {batch['_id']}: {str(e)}")
+            elif email_record is not None:
+                try:
+                    self._send_leased(database, email_record)
+                except Exception as e:
+                    # The lease expires and another claim retries the email
+                    logger.error(f"Error sending scheduled email {email_record['_id']}: {str(e)}")
+            else:
+                self._stop.wait(self.poll_interval)
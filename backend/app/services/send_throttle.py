@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError
+
+from app.services.rate_limiter import AdaptiveRateLimiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SES rejects sends above MaxSendRate with these codes
+THROTTLING_ERROR_CODES = frozenset({
+    "Throttling", "ThrottlingException", "MaxSendRateExceeded", "TooManyRequestsException"
+})
+# Failures where the same request is expected to succeed a little later
+TRANSIENT_ERROR_CODES = THROTTLING_ERROR_CODES | frozenset({
+    "ServiceUnavailable", "InternalFailure", "InternalError", "RequestTimeout", "RequestTimeoutException"
+})
+
+
+def error_code(error: Exception) -> Optional[str]:
+    if isinstance(error, ClientError):
+        return error.response.get('Error', {}).get('Code')
+    return None
+
+
+def is_throttling(error: Exception) -> bool:
+    return error_code(error) in THROTTLING_ERROR_CODES
+
+
+def is_transient(error: Exception) -> bool:
+    # A failed connection means the request never reached SES, so it can't have been sent
+    return error_code(error) in TRANSIENT_ERROR_CODES or isinstance(error, BotoConnectionError)
+
+
+def retry_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter, so retries from parallel senders spread out"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay + random.uniform(0, delay / 2)
+
+
+class SendThrottle:
+    """
+    Paces SES send calls with a shared AdaptiveRateLimiter and retries
+    transient failures.
+
+    Each attempt takes `cost` tokens (recipients) from the limiter.
+    Throttling errors lower its rate and successes raise it back towards
+    the quota. Transient errors are retried up to `max_attempts` times with
+    jittered backoff; the last error is raised so callers can re-queue.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveRateLimiter,
+        max_attempts: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0
+    ):
+        self.limiter = limiter
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+
+    async def call(self, send: Callable[[], Awaitable[T]], cost: float = 1.0) -> T:
+        attempt = 0
+        while True:
+            await self.limiter.acquire(cost)
+            try:
+                result = await send()
+            except Exception as e:
+                if is_throttling(e):
+                    self.limiter.record_throttle()
+                attempt += 1
+                if not is_transient(e) or attempt >= self.max_attempts:
+                    raise
+                delay = retry_delay(attempt - 1, self.backoff_base, self.backoff_max)
+                logger.warning(f"Transient SES error {error_code(e) or type(e).__name__}; "
+                               f"retrying in {delay:.1f}s at {self.limiter.rate:.1f}/s")
+                self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            self.limiter.record_success(cost)
+            return result
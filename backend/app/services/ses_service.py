@@ -1,58 +1,106 @@
 import asyncio
-from typing import List, Dict, Optional
-from datetime import datetime
-import boto3
-from botocore.exceptions import ClientError
+from typing import Awaitable, Callable, Iterable, List, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from botocore.exceptions import ClientError, ConnectionError as BotoConnectionError
 from fastapi import HTTPException
 from pydantic import EmailStr
-from apscheduler.schedulers.background import BackgroundScheduler
-from pymongo import MongoClient
 from app.config import Settings
 from app.models.schemas import EmailStatus
 from app.database import Database
+from app.services.analytics_rollup import AnalyticsRollup
+from app.services.dispatch_service import BulkDispatcher
+from app.services.email_writer import EmailRecordWriter
+from app.services.mime_builder import RawMessageTemplate
+from app.services.pipeline import Pipeline, PipelineStage
+from app.services.send_throttle import error_code, is_transient, retry_delay
+from app.services.ses_shards import SES_MAX_RECIPIENTS, SESShard, SESShardPool
+from app.services.ses_templates import SESBulkTemplate
+from app.services.ses_transport import SESTransport, create_ses_transport
+from app.services.suppression_service import SuppressionList
+from app.services.template_cache import LLMTemplateCache
+from app.services.template_engine import CompiledTemplate
 from datetime import timezone
-import pytz
 import logging
-from pymongo.errors import ConfigurationError
 from bson.objectid import ObjectId
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SESService:
-    _scheduler = None
-    
-    def __init__(self, settings: Settings, db: Database):
+    def __init__(
+        self,
+        settings: Settings,
+        db: Database,
+        transport: Optional[SESTransport] = None,
+        writer: Optional[EmailRecordWriter] = None,
+        rollup: Optional[AnalyticsRollup] = None,
+        shards: Optional[SESShardPool] = None
+    ):
         self.db = db
-        self.session = boto3.Session(
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION
+        self.settings = settings
+
+        # All SES calls go through a transport so boto3 never blocks the event loop.
+        # The process-wide instance is built by ServiceRegistry with a shared shard pool;
+        # sends are spread over its shards and other calls use the primary one.
+        self.transport = transport or (shards.primary.transport if shards else create_ses_transport(settings))
+        self.shards = shards or SESShardPool(
+            [SESShard("default", self.transport, settings.SENDER_EMAIL)],
+            settings,
+            failure_threshold=settings.SES_SHARD_FAILURE_THRESHOLD,
+            cooldown=settings.SES_SHARD_COOLDOWN_SECONDS
+        )
+        # Email records and status changes are written behind in batches,
+        # and every status change is counted in the analytics rollup
+        self.rollup = rollup or AnalyticsRollup(db)
+        self.writer = writer or EmailRecordWriter(
+            db,
+            batch_size=settings.EMAIL_WRITE_BATCH_SIZE,
+            flush_interval=settings.EMAIL_WRITE_FLUSH_INTERVAL_SECONDS,
+            rollup=self.rollup
         )
-        self.client = self.session.client('ses')
         self.sender_email = settings.SENDER_EMAIL
+        # Loaded by ServiceRegistry on startup; bulk routes filter rows against it
+        self.suppressions = SuppressionList(db, max_age=settings.SUPPRESSION_REFRESH_SECONDS)
+        self.template_cache = LLMTemplateCache(
+            db,
+            max_entries=settings.LLM_TEMPLATE_CACHE_SIZE,
+            ttl_hours=settings.LLM_TEMPLATE_CACHE_TTL_HOURS
+        )
         
-        # Extract connection info safely
-        try:
-            self.db_host = db.client.address[0]
-            self.db_name = db.client.get_database().name
-        except (ConfigurationError, AttributeError):
-            self.db_host = settings.MONGODB_URL
-            self.db_name = settings.MONGODB_DB_NAME
-        
-        logger.info(f"Initialized SESService with database: {self.db_name}")
-        
-        # Initialize scheduler only once
-        if SESService._scheduler is None:
-            SESService._scheduler = BackgroundScheduler(timezone=pytz.UTC)
-            SESService._scheduler.start()
-        self.scheduler = SESService._scheduler
+        logger.info(f"Initialized SESService with database: {db.name}")
 
     def _get_sync_database(self):
-        """Helper method to create a new synchronous database connection"""
-        client = MongoClient(self.db_host)
-        return client[self.db_name]
+        """Helper method to get the shared, pooled synchronous database"""
+        return Database.get_sync_db()
     
+    async def _send_call(
+        self,
+        operation: str,
+        routing_key: str,
+        request: Callable[[SESShard], Dict],
+        recipients: int = 1,
+        prepare: Optional[Callable[[SESShard], Awaitable[None]]] = None
+    ) -> Tuple[Dict, SESShard]:
+        """Call an SES send operation on the recipient's shard; raises once retries and failover are exhausted"""
+        return await self.shards.send(operation, routing_key, request, recipients=recipients, prepare=prepare)
+
+    @staticmethod
+    def _error_details(error: Exception) -> Tuple[str, str]:
+        if isinstance(error, ClientError):
+            return error.response['Error']['Code'], error.response['Error']['Message']
+        return type(error).__name__, str(error)
+
+    def _requeue_fields(self, error_code: Optional[str], error_message: str, requeues: int = 0) -> Dict:
+        """Fields that hand an email back to the scheduler after a jittered delay"""
+        delay = retry_delay(requeues, self.settings.SES_REQUEUE_DELAY_SECONDS, 3600)
+        return {
+            "status": EmailStatus.SCHEDULED,
+            "scheduled_time": self.get_utc_now() + timedelta(seconds=delay),
+            "requeue_count": requeues + 1,
+            "error_code": error_code,
+            "error_message": error_message
+        }
+
     def get_utc_now(self) -> datetime:
         return datetime.now(timezone.utc)
 
@@ -61,81 +109,103 @@ class SESService:
             return dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
 
-    def _send_email_sync(self, email_record: Dict) -> Dict:
-        """Synchronous method to send email via AWS SES"""
-        try:
-            message = {
-                'Subject': {
-                    'Data': email_record['subject'],
+    @staticmethod
+    def _build_message(subject: str, body_html: str, body_text: Optional[str] = None) -> Dict:
+        """Build the SES SendEmail Message structure"""
+        message = {
+            'Subject': {
+                'Data': subject,
+                'Charset': 'UTF-8'
+            },
+            'Body': {
+                'Html': {
+                    'Data': body_html,
                     'Charset': 'UTF-8'
-                },
-                'Body': {
-                    'Html': {
-                        'Data': email_record['body_html'],
-                        'Charset': 'UTF-8'
-                    }
                 }
             }
+        }
 
-            if email_record.get('body_text'):
-                message['Body']['Text'] = {
-                    'Data': email_record['body_text'],
-                    'Charset': 'UTF-8'
-                }
+        if body_text:
+            message['Body']['Text'] = {
+                'Data': body_text,
+                'Charset': 'UTF-8'
+            }
+        return message
 
-            response = self.client.send_email(
-                Source=self.sender_email,
-                Destination={
-                    'ToAddresses': email_record['recipient_emails'],
+    def _send_email_sync(self, email_record: Dict) -> Dict:
+        """Synchronous method to send email via AWS SES"""
+        try:
+            message = self._build_message(
+                email_record['subject'],
+                email_record['body_html'],
+                email_record.get('body_text')
+            )
+
+            response, shard = self.shards.send_sync(
+                'send_email',
+                email_record['recipient_emails'][0],
+                lambda shard: {
+                    'Source': shard.sender_email,
+                    'Destination': {
+                        'ToAddresses': email_record['recipient_emails'],
+                    },
+                    'Message': message
                 },
-                Message=message
+                recipients=len(email_record['recipient_emails'])
             )
             
             return {
                 'success': True,
-                'message_id': response['MessageId']
+                'message_id': response['MessageId'],
+                'ses_shard': shard.name
             }
         except Exception as e:
             logger.error(f"Failed to send email: {str(e)}")
             return {
                 'success': False,
-                'error': str(e)
+                'error': str(e),
+                'error_code': error_code(e),
+                'retryable': is_transient(e)
             }
 
-    def _send_scheduled_email(self, email_id: str):
-        """Synchronous method to handle scheduled email sending"""
-        client = None
+    def _send_scheduled_email(self, email_record: Dict, lease_owner: str) -> bool:
+        """
+        Synchronous method to send a scheduled email claimed by EmailScheduler.
+        Returns whether the email was sent.
+
+        EmailScheduler confirms and extends the lease right before calling
+        this. Status updates are conditional on still holding the lease, so a
+        worker whose lease expired can't overwrite the outcome recorded by
+        another.
+        """
+        email_id = email_record["_id"]
+        database = None
         try:
-            # Create new synchronous database connection
-            client = MongoClient(self.db_host)
-            database = client[self.db_name]
-            
-            # Ensure email_id is ObjectId
-            if isinstance(email_id, str):
-                email_id = ObjectId(email_id)
+            # Reuse the pooled synchronous connection
+            database = self._get_sync_database()
             
-            logger.info(f"Fetching email record for ID: {email_id}")
-            
-            # Get email record using synchronous operation
-            email_record = database.emails.find_one({"_id": email_id})
-            
-            if not email_record:
-                logger.error(f"Email record {email_id} not found")
-                return
-            
-            logger.info(f"Sending scheduled email to {email_record.get('recipient_emails', [])}")
+            logger.info(f"Sending scheduled email {email_id} to {email_record.get('recipient_emails', [])}")
             
             # Send email
             result = self._send_email_sync(email_record)
             
             # Update status
+            requeues = email_record.get("requeue_count", 0)
             if result['success']:
                 update_data = {
                     "status": EmailStatus.SENT,
                     "message_id": result['message_id'],
+                    "ses_shard": result['ses_shard'],
                     "sent_at": self.get_utc_now()
                 }
                 logger.info(f"Email {email_id} sent successfully")
+            elif result['retryable'] and requeues < self.settings.SES_MAX_REQUEUES:
+                # Throttled or SES briefly unavailable: try again later, outside any batch
+                update_data = {
+                    **self._requeue_fields(result['error_code'], result['error'], requeues),
+                    "batch_id": None
+                }
+                logger.warning(f"Re-queued email {email_id} for {update_data['scheduled_time']}: {result['error']}")
             else:
                 update_data = {
                     "status": EmailStatus.FAILED,
@@ -145,31 +215,34 @@ class SESService:
                 logger.error(f"Failed to send email {email_id}: {result['error']}")
             
             # Update the database using synchronous operation
-            database.emails.update_one(
-                {"_id": email_id},
-                {"$set": update_data}
+            updated = database.emails.update_one(
+                {"_id": email_id, "lease_owner": lease_owner},
+                {"$set": update_data, "$unset": {"lease_owner": "", "lease_expires_at": ""}}
             )
+            if updated.modified_count:
+                self.rollup.record_transition(EmailStatus.SCHEDULED, update_data["status"])
+            return result['success']
             
         except Exception as e:
             logger.error(f"Error in scheduled email job for {email_id}: {str(e)}")
-            if client:
+            if database is not None:
                 try:
-                    database = client[self.db_name]
-                    database.emails.update_one(
-                        {"_id": email_id},
+                    updated = database.emails.update_one(
+                        {"_id": email_id, "lease_owner": lease_owner},
                         {
                             "$set": {
                                 "status": EmailStatus.FAILED,
                                 "error_message": str(e),
                                 "failed_at": self.get_utc_now()
-                            }
+                            },
+                            "$unset": {"lease_owner": "", "lease_expires_at": ""}
                         }
                     )
+                    if updated.modified_count:
+                        self.rollup.record_transition(EmailStatus.SCHEDULED, EmailStatus.FAILED)
                 except Exception as update_error:
                     logger.error(f"Failed to update error status for {email_id}: {str(update_error)}")
-        finally:
-            if client:
-                client.close()
+            return False
 
     async def _schedule_email(
         self,
@@ -177,9 +250,10 @@ class SESService:
         subject: str,
         body_html: str,
         body_text: Optional[str],
-        scheduled_time: datetime
+        scheduled_time: datetime,
+        campaign_id: Optional[str] = None
     ) -> Dict:
-        """Schedule email for later sending"""
+        """Store email for later sending; EmailScheduler picks it up once due"""
         now = self.get_utc_now()
         scheduled_time = self.ensure_timezone_aware(scheduled_time)
 
@@ -195,20 +269,13 @@ class SESService:
             "status": EmailStatus.SCHEDULED,
             "created_at": now
         }
+        if campaign_id:
+            email_record["campaign_id"] = campaign_id
 
-        email_id = await self.db.emails.insert_one(email_record)
-        str_email_id = str(email_id.inserted_id)
+        email_id = await self.writer.insert(email_record)
+        str_email_id = str(email_id)
 
         logger.info(f"Scheduling email {str_email_id} for {scheduled_time}")
-        
-        self.scheduler.add_job(
-            self._send_scheduled_email,
-            trigger='date',
-            run_date=scheduled_time,
-            args=[str_email_id],
-            id=str_email_id,
-            misfire_grace_time=None
-        )
 
         return {
             "message": "Email scheduled successfully",
@@ -219,7 +286,16 @@ class SESService:
 
     async def get_email_status(self, email_id: str) -> Dict:
         """Get the current status of an email"""
-        email_record = await self.db.emails.find_one({"_id": email_id})
+        if isinstance(email_id, str):
+            email_id = ObjectId(email_id)
+        pending = self.writer.get_pending(email_id)
+        # A buffered insert is a complete record; buffered updates overlay the stored one
+        if pending is not None and "recipient_emails" in pending:
+            email_record = pending
+        else:
+            email_record = await self.db.emails.find_one({"_id": email_id})
+            if email_record and pending:
+                email_record.update(pending)
         if not email_record:
             raise HTTPException(status_code=404, detail="Email not found")
         return {
@@ -235,8 +311,10 @@ class SESService:
         subject: str,
         body_html: str,
         body_text: Optional[str] = None,
-        scheduled_time: Optional[datetime] = None
+        scheduled_time: Optional[datetime] = None,
+        campaign_id: Optional[str] = None
     ) -> Dict:
+        self._check_recipients(to_addresses)
         if scheduled_time:
             # Ensure scheduled_time is timezone-aware
             scheduled_time = self.ensure_timezone_aware(scheduled_time)
@@ -245,7 +323,8 @@ class SESService:
                 subject,
                 body_html,
                 body_text,
-                scheduled_time
+                scheduled_time,
+                campaign_id
             )
 
         # Create email record with UTC timestamp
@@ -257,77 +336,207 @@ class SESService:
             "status": EmailStatus.PENDING,
             "created_at": self.get_utc_now()
         }
+        if campaign_id:
+            email_record["campaign_id"] = campaign_id
 
-        email_id = await self.db.emails.insert_one(email_record)
+        email_id = await self.writer.insert(email_record)
 
         try:
-            message = {
-                'Subject': {
-                    'Data': subject,
-                    'Charset': 'UTF-8'
-                },
-                'Body': {
-                    'Html': {
-                        'Data': body_html,
-                        'Charset': 'UTF-8'
-                    }
-                }
-            }
+            message = self._build_message(subject, body_html, body_text)
 
-            if body_text:
-                message['Body']['Text'] = {
-                    'Data': body_text,
-                    'Charset': 'UTF-8'
-                }
-
-            response = self.client.send_email(
-                Source=self.sender_email,
-                Destination={
-                    'ToAddresses': to_addresses,
+            response, shard = await self._send_call(
+                'send_email',
+                to_addresses[0],
+                lambda shard: {
+                    'Source': shard.sender_email,
+                    'Destination': {
+                        'ToAddresses': to_addresses,
+                    },
+                    'Message': message
                 },
-                Message=message
+                recipients=len(to_addresses)
             )
 
             # Update status to SENT
-            await self.db.emails.update_one(
-                {"_id": email_id.inserted_id},
-                {
-                    "$set": {
-                        "status": EmailStatus.SENT,
-                        "message_id": response['MessageId'],
-                        "sent_at": self.get_utc_now()
-                    }
-                }
-            )
+            await self.writer.update(email_id, {
+                "status": EmailStatus.SENT,
+                "message_id": response['MessageId'],
+                "ses_shard": shard.name,
+                "sent_at": self.get_utc_now()
+            }, previous_status=EmailStatus.PENDING)
 
             return {
                 'message_id': response['MessageId'],
                 'status': EmailStatus.SENT,
-                'email_id': str(email_id.inserted_id),
+                'email_id': str(email_id),
                 'recipients': to_addresses
             }
 
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            error_message = e.response['Error']['Message']
+        except (ClientError, BotoConnectionError) as e:
+            error_code, error_message = self._error_details(e)
 
-            await self.db.emails.update_one(
-                {"_id": email_id.inserted_id},
-                {
-                    "$set": {
-                        "status": EmailStatus.FAILED,
-                        "error_code": error_code,
-                        "error_message": error_message,
-                        "failed_at": self.get_utc_now()
-                    }
+            if is_transient(e):
+                # Throttled or SES briefly unavailable: the scheduler sends it later
+                requeue = self._requeue_fields(error_code, error_message)
+                await self.writer.update(email_id, requeue, previous_status=EmailStatus.PENDING)
+                logger.warning(f"Re-queued email {email_id} for {requeue['scheduled_time']}: {error_code}")
+                return {
+                    'status': EmailStatus.SCHEDULED,
+                    'email_id': str(email_id),
+                    'recipients': to_addresses,
+                    'scheduled_time': requeue['scheduled_time'],
+                    'message': f"Re-queued after transient SES error {error_code}"
                 }
-            )
+
+            await self.writer.update(email_id, {
+                "status": EmailStatus.FAILED,
+                "error_code": error_code,
+                "error_message": error_message,
+                "failed_at": self.get_utc_now()
+            }, previous_status=EmailStatus.PENDING)
 
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to send email: {error_code} - {error_message}"
             )
 
+    @staticmethod
+    def _check_recipients(to_addresses: List[EmailStr]):
+        """Fail fast on sends SES would reject, before they take throttle tokens"""
+        if not to_addresses:
+            raise HTTPException(status_code=400, detail="At least one recipient is required")
+        if len(to_addresses) > SES_MAX_RECIPIENTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {SES_MAX_RECIPIENTS} recipients per email, got {len(to_addresses)}"
+            )
+
+    async def deliver(
+        self,
+        to_addresses: List[EmailStr],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str] = None
+    ) -> Dict:
+        """Send an email via SES without touching MongoDB; see record_delivery"""
+        message = self._build_message(subject, body_html, body_text)
+        try:
+            response, shard = await self._send_call(
+                'send_email',
+                to_addresses[0],
+                lambda shard: {
+                    'Source': shard.sender_email,
+                    'Destination': {
+                        'ToAddresses': to_addresses,
+                    },
+                    'Message': message
+                },
+                recipients=len(to_addresses)
+            )
+            return {
+                'success': True,
+                'message_id': response['MessageId'],
+                'ses_shard': shard.name
+            }
+        except (ClientError, BotoConnectionError) as e:
+            return self._delivery_failure(e)
+
+    def _delivery_failure(self, error: Exception) -> Dict:
+        code, message = self._error_details(error)
+        return {
+            'success': False,
+            'error_code': code,
+            'error_message': message,
+            'retryable': is_transient(error)
+        }
+
+    async def deliver_raw(self, recipient_email: EmailStr, render: Callable[[str], bytes]) -> Dict:
+        """
+        Send a MIME message via SES SendRawEmail; same result shape as `deliver`.
+
+        `render` builds the message for a sender address, since the From
+        header follows the shard the recipient is routed to.
+        """
+        try:
+            response, shard = await self._send_call(
+                'send_raw_email',
+                recipient_email,
+                lambda shard: {
+                    'Source': shard.sender_email,
+                    'Destinations': [recipient_email],
+                    'RawMessage': {'Data': render(shard.sender_email)}
+                }
+            )
+            return {
+                'success': True,
+                'message_id': response['MessageId'],
+                'ses_shard': shard.name
+            }
+        except (ClientError, BotoConnectionError) as e:
+            return self._delivery_failure(e)
+
+    async def record_delivery(
+        self,
+        to_addresses: List[EmailStr],
+        subject: str,
+        body_html: str,
+        body_text: Optional[str],
+        delivery: Dict,
+        campaign_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Store the outcome of `deliver` as a single SENT or FAILED email record.
+
+        A transient failure is stored as SCHEDULED for the scheduler to retry
+        instead, and reported as such rather than raised.
+        """
+        now = self.get_utc_now()
+        email_record = {
+            "recipient_emails": to_addresses,
+            "subject": subject,
+            "body_html": body_html,
+            "body_text": body_text,
+            "created_at": now
+        }
+        if campaign_id:
+            email_record["campaign_id"] = campaign_id
+
+        if delivery['success']:
+            email_record.update({
+                "status": EmailStatus.SENT,
+                "message_id": delivery['message_id'],
+                "ses_shard": delivery.get('ses_shard'),
+                "sent_at": now
+            })
+        elif delivery.get('retryable'):
+            email_record.update(self._requeue_fields(delivery['error_code'], delivery['error_message']))
+        else:
+            email_record.update({
+                "status": EmailStatus.FAILED,
+                "error_code": delivery['error_code'],
+                "error_message": delivery['error_message'],
+                "failed_at": now
+            })
+
+        email_id = await self.writer.insert(email_record)
+
+        if email_record["status"] == EmailStatus.SCHEDULED:
+            return {
+                'status': EmailStatus.SCHEDULED,
+                'email_id': str(email_id),
+                'recipients': to_addresses,
+                'scheduled_time': email_record['scheduled_time']
+            }
+
+        if not delivery['success']:
+            raise ValueError(f"Failed to send email: {delivery['error_code']} - {delivery['error_message']}")
+        return {
+            'message_id': delivery['message_id'],
+            'status': EmailStatus.SENT,
+            'email_id': str(email_id),
+            'recipients': to_addresses
+        }
+
     async def update_email_status(self, email_id: str, status: EmailStatus, error_details: Optional[Dict] = None) -> None:
         """Update email status and related details"""
         update_data = {
@@ -338,15 +547,16 @@ class SESService:
         if error_details:
             update_data.update(error_details)
 
-        await self.db.emails.update_one(
-            {"_id": email_id},
-            {"$set": update_data}
-        )
+        if isinstance(email_id, str):
+            email_id = ObjectId(email_id)
+        current = await self.get_email_status(email_id)
+        await self.writer.update(email_id, update_data, previous_status=current["status"])
 
     async def verify_email_identity(self, email: EmailStr) -> Dict:
         """Verify an email address with Amazon SES"""
         try:
-            response = self.client.verify_email_identity(
+            response = await self.transport.call(
+                'verify_email_identity',
                 EmailAddress=email
             )
             return {
@@ -360,10 +570,12 @@ class SESService:
             )
 
     async def get_send_statistics(self) -> Dict:
-        """Get sending statistics from Amazon SES"""
+        """Get sending statistics from Amazon SES, combined across the shards' accounts and regions"""
         try:
-            response = self.client.get_send_statistics()
-            return response['SendDataPoints']
+            responses = await asyncio.gather(*(
+                transport.call('get_send_statistics') for transport in self.shards.transports
+            ))
+            return [point for response in responses for point in response['SendDataPoints']]
         except ClientError as e:
             raise HTTPException(
                 status_code=500,
@@ -389,7 +601,10 @@ class SESService:
             scheduled_time: Optional scheduled send time
         """
         from app.services.llm_service import generate_email_content
-        
+
+        # Before paying for generation
+        self._check_recipients(to_addresses)
+
         # Generate email content with template data
         email_content = await generate_email_content(
             situation=situation,
@@ -398,11 +613,7 @@ class SESService:
         )
         
         # Replace template variables in generated content
-        for key, value in template_data.items():
-            placeholder = f"{{{key}}}"
-            email_content['subject'] = email_content['subject'].replace(placeholder, str(value))
-            email_content['html_body'] = email_content['html_body'].replace(placeholder, str(value))
-            email_content['text_body'] = email_content['text_body'].replace(placeholder, str(value))
+        email_content = self._fill_placeholders(email_content, template_data)
         
         # Send the personalized email
         return await self.send_email(
@@ -413,35 +624,527 @@ class SESService:
             scheduled_time=scheduled_time
     )
 
+    @staticmethod
+    def _fill_placeholders(email_content: Dict[str, str], template_data: Dict) -> Dict[str, str]:
+        for key, value in template_data.items():
+            placeholder = f"{{{key}}}"
+            email_content['subject'] = email_content['subject'].replace(placeholder, str(value))
+            email_content['html_body'] = email_content['html_body'].replace(placeholder, str(value))
+            email_content['text_body'] = email_content['text_body'].replace(placeholder, str(value))
+        return email_content
+
+    async def generate_and_send_bulk_per_row(
+        self,
+        csv_data: Iterable[Dict],
+        recipient_column: str,
+        situation: str,
+        keywords: List[str],
+        scheduled_time: Optional[datetime] = None,
+        campaign_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Generate, render, send and persist an email per CSV row.
+
+        The four steps run as pipeline stages with their own worker pools,
+        so LLM latency overlaps with SES sends and MongoDB writes.
+        Returns the per-row results and the pipeline metrics; with
+        `on_result`, results are handed to it as they complete instead.
+        """
+        from app.services.llm_service import generate_email_content
+
+        results: Dict[int, Dict] = {}
+        campaign_id = campaign_id or str(ObjectId())
+
+        def emit(index: int, result: Dict):
+            if on_result:
+                on_result(result)
+            else:
+                results[index] = result
+
+        async def generate(item: Dict) -> Dict:
+            item['content'] = await generate_email_content(
+                situation=situation,
+                keywords=keywords,
+                data=item['template_data']
+            )
+            return item
+
+        async def render(item: Dict) -> Dict:
+            item['content'] = self._fill_placeholders(item['content'], item['template_data'])
+            return item
+
+        async def send(item: Dict) -> Dict:
+            # Scheduled emails are stored by the persist stage and sent later
+            # deliver() paces itself through its shard's send throttle
+            if not scheduled_time:
+                content = item['content']
+                item['delivery'] = await self.deliver(
+                    [item['email']], content['subject'], content['html_body'], content['text_body']
+                )
+            return item
+
+        async def persist(item: Dict) -> None:
+            content = item['content']
+            if scheduled_time:
+                result = await self._schedule_email(
+                    [item['email']], content['subject'], content['html_body'],
+                    content['text_body'], scheduled_time, campaign_id
+                )
+            else:
+                result = await self.record_delivery(
+                    [item['email']], content['subject'], content['html_body'],
+                    content['text_body'], item['delivery'], campaign_id
+                )
+            emit(item['index'], {
+                'status': 'success',
+                'email': item['email'],
+                'result': result
+            })
+
+        def on_error(item: Dict, stage: str, error: Exception):
+            emit(item['index'], {
+                'status': 'error',
+                'email': item['email'],
+                'error': str(error)
+            })
+
+        settings = self.settings
+        pipeline = Pipeline(
+            [
+                PipelineStage("generate", generate, settings.PIPELINE_GENERATE_WORKERS, settings.PIPELINE_QUEUE_SIZE),
+                PipelineStage("render", render, 1, settings.PIPELINE_QUEUE_SIZE),
+                PipelineStage("send", send, settings.BULK_SEND_CONCURRENCY, settings.PIPELINE_QUEUE_SIZE),
+                PipelineStage("persist", persist, settings.PIPELINE_PERSIST_WORKERS, settings.PIPELINE_QUEUE_SIZE),
+            ],
+            on_error=on_error
+        )
+        items = (
+            {
+                'index': index,
+                'email': row.get(recipient_column, 'unknown'),
+                'template_data': row
+            }
+            for index, row in enumerate(csv_data)
+        )
+        await pipeline.run(items)
+
+        return [results[index] for index in range(len(results))], pipeline.metrics()
+
+    async def generate_and_send_bulk_from_template(
+        self,
+        csv_data: List[Dict[str, str]],
+        recipient_column: str,
+        situation: str,
+        keywords: List[str],
+        scheduled_time: Optional[datetime] = None,
+        campaign_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Generate one email template for the CSV columns and render it per row.
+
+        The LLM is called at most once per unique (situation, keywords,
+        columns); the template is cached, so reruns skip the LLM entirely.
+        """
+        if not csv_data:
+            return []
+        columns = list(csv_data[0].keys())
+        template = await self.template_cache.get_or_generate(situation, keywords, columns)
+
+        subject_template = CompiledTemplate(template['subject'], columns)
+        html_template = CompiledTemplate(template['html_body'], columns)
+        text_template = CompiledTemplate(template['text_body'], columns)
+
+        rows = (
+            {
+                recipient_column: row.get(recipient_column),
+                "email_subject": subject_template.render(row),
+                "email_content": html_template.render(row),
+                "email_text": text_template.render(row),
+                "template_data": row
+            }
+            for row in csv_data
+        )
+
+        # Keep the per-row result shape of the per-row generation mode
+        def reshape(result: Dict) -> Dict:
+            if result['status'] == 'error':
+                return {
+                    'status': 'error',
+                    'email': result['email'],
+                    'error': result['error']
+                }
+            return {
+                'status': 'success',
+                'email': result['email'],
+                'result': {k: v for k, v in result.items() if k not in ('email', 'template_data')}
+            }
+
+        results = await self.send_bulk_templated_emails(
+            csv_data=rows,
+            recipient_column=recipient_column,
+            scheduled_time=scheduled_time,
+            campaign_id=campaign_id,
+            on_result=(lambda result: on_result(reshape(result))) if on_result else None
+        )
+        return [reshape(result) for result in results]
+
+    @staticmethod
+    def _get_recipient(row: Dict, recipient_column: str) -> str:
+        recipient_email = row[recipient_column]
+        if not isinstance(recipient_email, str) or '@' not in recipient_email:
+            raise ValueError(f"Invalid email address: {recipient_email}")
+        return recipient_email
+
     async def send_bulk_templated_emails(
         self,
-        csv_data: List[Dict],
+        csv_data: Iterable[Dict],
         recipient_column: str,
-        scheduled_time: Optional[datetime] = None
+        scheduled_time: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        batch_interval_minutes: int = 60,
+        campaign_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
     ) -> List[Dict]:
         """
         Send templated emails to multiple recipients based on CSV data.
+
+        Rows are dispatched concurrently by a bounded worker pool, throttled
+        to the SES per-second send quota. Results keep the input row order,
+        or are handed to `on_result` as they complete when it is given.
+        Scheduled sends with a batch_size are split into timed batches instead.
         """
-        results = []
-        for row in csv_data:
+        campaign_id = campaign_id or str(ObjectId())
+
+        if scheduled_time and batch_size:
+            results = await self.schedule_campaign(
+                csv_data,
+                recipient_column,
+                scheduled_time,
+                batch_size,
+                batch_interval_minutes,
+                campaign_id
+            )
+            if not on_result:
+                return results
+            for result in results:
+                on_result(result)
+            return []
+
+        async def send_row(row: Dict) -> Dict:
             try:
-                recipient_email = row[recipient_column]
-                if not isinstance(recipient_email, str) or '@' not in recipient_email:
-                    raise ValueError(f"Invalid email address: {recipient_email}")
+                recipient_email = self._get_recipient(row, recipient_column)
 
                 result = await self.send_email(
                     to_addresses=[recipient_email],
                     subject=row['email_subject'],
                     body_html=row['email_content'],
-                    scheduled_time=scheduled_time
+                    body_text=row.get('email_text'),
+                    scheduled_time=scheduled_time,
+                    campaign_id=campaign_id
                 )
 
-                results.append({
+                return {
                     'status': 'success',
                     'email': recipient_email,
                     'template_data': row['template_data'],
                     **result
+                }
+            except Exception as e:
+                return {
+                    'status': 'error',
+                    'email': row.get(recipient_column, 'unknown'),
+                    'template_data': row.get('template_data', {}),
+                    'error': str(e)
+                }
+
+        # Immediate sends are paced by their shard's throttle in send_email; scheduled rows only hit MongoDB
+        dispatcher = BulkDispatcher(concurrency=self.settings.BULK_SEND_CONCURRENCY)
+        return await dispatcher.dispatch(csv_data, send_row, on_result=on_result)
+
+    async def send_bulk_with_ses_template(
+        self,
+        csv_data: Iterable[Dict],
+        template: str,
+        subject_template: str,
+        placeholder_columns: List[str],
+        recipient_column: str,
+        campaign_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Send raw CSV rows through SES SendBulkTemplatedEmail.
+
+        The subject/body templates are registered once as an SES template
+        and SES substitutes each row's placeholder values, so bodies are never
+        rendered here and each API call covers up to SES_BULK_DESTINATIONS
+        recipients. Every destination gets its own SENT or FAILED record,
+        which stores the template name and row values instead of a body.
+        Templates Handlebars cannot express are rendered here and sent per
+        recipient instead.
+        """
+        campaign_id = campaign_id or str(ObjectId())
+        try:
+            bulk_template = SESBulkTemplate(subject_template, template, placeholder_columns)
+        except ValueError as e:
+            logger.warning(f"Sending campaign {campaign_id} per recipient: {str(e)}")
+            body = CompiledTemplate(template, placeholder_columns)
+            subject = CompiledTemplate(subject_template, placeholder_columns)
+
+            def rendered():
+                for row in csv_data:
+                    mapping = {column: str(row[column]) for column in placeholder_columns}
+                    yield {
+                        "email_content": body.render(mapping),
+                        "email_subject": subject.render(mapping),
+                        "template_data": mapping,
+                        **row
+                    }
+
+            return await self.send_bulk_templated_emails(
+                rendered(),
+                recipient_column,
+                campaign_id=campaign_id,
+                on_result=on_result
+            )
+
+        def entries():
+            for row in csv_data:
+                mapping = {column: row[column] for column in placeholder_columns}
+                try:
+                    yield {'email': self._get_recipient(row, recipient_column), 'template_data': mapping}
+                except Exception as e:
+                    yield {'email': row.get(recipient_column, 'unknown'), 'template_data': mapping, 'error': str(e)}
+
+        def chunks():
+            # One call has a single sender, so destinations are grouped by shard
+            pending: Dict[str, List[Dict]] = {}
+            for entry in entries():
+                shard = self.shards.route(entry['email']).name if 'error' not in entry else None
+                chunk = pending.setdefault(shard, [])
+                chunk.append(entry)
+                if len(chunk) >= self.settings.SES_BULK_DESTINATIONS:
+                    yield pending.pop(shard)
+            yield from pending.values()
+
+        async def send_chunk(chunk: List[Dict]) -> Dict:
+            valid = [entry for entry in chunk if 'error' not in entry]
+            statuses = []
+            shard = None
+            if valid:
+                try:
+                    # SES counts every destination against the per-second send quota
+                    response, shard = await self._send_call(
+                        'send_bulk_templated_email',
+                        valid[0]['email'],
+                        lambda shard: {
+                            'Source': shard.sender_email,
+                            'Template': bulk_template.name,
+                            'DefaultTemplateData': '{}',
+                            'Destinations': [
+                                {
+                                    'Destination': {'ToAddresses': [entry['email']]},
+                                    'ReplacementTemplateData': bulk_template.replacement_data(entry['template_data'])
+                                }
+                                for entry in valid
+                            ]
+                        },
+                        recipients=len(valid),
+                        prepare=lambda shard: shard.templates.ensure(bulk_template)
+                    )
+                    statuses = response['Status']
+                except (ClientError, BotoConnectionError) as e:
+                    # Records carry no rendered body for the scheduler, so exhausted retries are FAILED
+                    code, message = self._error_details(e)
+                    statuses = [{'Status': code, 'Error': message}] * len(valid)
+
+            now = self.get_utc_now()
+            for entry, status in zip(valid, statuses):
+                email_record = {
+                    "recipient_emails": [entry['email']],
+                    "ses_template": bulk_template.name,
+                    "template_data": entry['template_data'],
+                    "created_at": now,
+                    "campaign_id": campaign_id
+                }
+                if status['Status'] == 'Success':
+                    email_record.update({
+                        "status": EmailStatus.SENT,
+                        "message_id": status['MessageId'],
+                        "ses_shard": shard.name,
+                        "sent_at": now
+                    })
+                    entry.update({'status': 'success', 'message_id': status['MessageId']})
+                else:
+                    email_record.update({
+                        "status": EmailStatus.FAILED,
+                        "error_code": status['Status'],
+                        "error_message": status.get('Error'),
+                        "failed_at": now
+                    })
+                    entry.update({'status': 'error', 'error': f"{status['Status']} - {status.get('Error')}"})
+                entry['email_id'] = str(await self.writer.insert(email_record))
+
+            for entry in chunk:
+                entry.setdefault('status', 'error')
+            return {'results': chunk}
+
+        dispatcher = BulkDispatcher(concurrency=self.settings.BULK_SEND_CONCURRENCY)
+
+        def on_chunk(chunk_result: Dict):
+            for result in chunk_result.get('results', []):
+                on_result(result)
+
+        chunk_results = await dispatcher.dispatch(
+            chunks(),
+            send_chunk,
+            on_result=on_chunk if on_result else None
+        )
+        return [result for chunk_result in chunk_results for result in chunk_result.get('results', [])]
+
+    async def send_bulk_raw_mime(
+        self,
+        csv_data: Iterable[Dict],
+        template: str,
+        subject_template: str,
+        placeholder_columns: List[str],
+        recipient_column: str,
+        campaign_id: Optional[str] = None,
+        on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Send raw CSV rows via SES SendRawEmail from a per-campaign MIME skeleton.
+
+        Headers, boundaries and static parts are encoded once; each row only
+        encodes its To header, subject and body before the join.
+        """
+        campaign_id = campaign_id or str(ObjectId())
+        # One skeleton per shard sender, built the first time a row routes to it
+        skeletons: Dict[str, RawMessageTemplate] = {}
+
+        def skeleton(sender_email: str) -> RawMessageTemplate:
+            if sender_email not in skeletons:
+                skeletons[sender_email] = RawMessageTemplate(
+                    sender_email,
+                    subject_template,
+                    template,
+                    placeholders=placeholder_columns
+                )
+            return skeletons[sender_email]
+
+        message_template = skeleton(self.sender_email)
+
+        async def send_row(row: Dict) -> Dict:
+            template_mapping = {column: str(row[column]) for column in placeholder_columns}
+            try:
+                recipient_email = self._get_recipient(row, recipient_column)
+                parts = message_template.render_parts(template_mapping)
+                delivery = await self.deliver_raw(
+                    recipient_email,
+                    lambda sender_email: skeleton(sender_email).render(recipient_email, parts=parts)
+                )
+                result = await self.record_delivery(
+                    [recipient_email],
+                    parts['subject'],
+                    parts['body_html'],
+                    parts['body_text'],
+                    delivery,
+                    campaign_id=campaign_id
+                )
+                return {
+                    'status': 'success',
+                    'email': recipient_email,
+                    'template_data': template_mapping,
+                    **result
+                }
+            except Exception as e:
+                return {
+                    'status': 'error',
+                    'email': row.get(recipient_column, 'unknown'),
+                    'template_data': template_mapping,
+                    'error': str(e)
+                }
+
+        # deliver_raw() paces itself through its shard's send throttle
+        dispatcher = BulkDispatcher(concurrency=self.settings.BULK_SEND_CONCURRENCY)
+        return await dispatcher.dispatch(csv_data, send_row, on_result=on_result)
+
+    async def schedule_campaign(
+        self,
+        csv_data: Iterable[Dict],
+        recipient_column: str,
+        scheduled_time: datetime,
+        batch_size: int,
+        batch_interval_minutes: int,
+        campaign_id: str
+    ) -> List[Dict]:
+        """
+        Schedule a bulk send as batches of `batch_size` emails, released
+        every `batch_interval_minutes` starting at `scheduled_time`.
+
+        Each batch is a single email_batches document that EmailScheduler
+        claims as one job; its emails are inserted with one insert_many.
+        """
+        scheduled_time = self.ensure_timezone_aware(scheduled_time)
+        if scheduled_time <= self.get_utc_now():
+            raise ValueError("Scheduled time must be in the future")
+
+        results = []
+        pending = []
+        batch_index = 0
+
+        async def flush_batch():
+            nonlocal batch_index
+            batch_id = ObjectId()
+            release_time = scheduled_time + timedelta(minutes=batch_interval_minutes * batch_index)
+            now = self.get_utc_now()
+
+            email_records = []
+            for _, row, recipient_email in pending:
+                email_records.append({
+                    "recipient_emails": [recipient_email],
+                    "subject": row['email_subject'],
+                    "body_html": row['email_content'],
+                    "body_text": row.get('email_text'),
+                    "scheduled_time": release_time,
+                    "status": EmailStatus.SCHEDULED,
+                    "created_at": now,
+                    "campaign_id": campaign_id,
+                    "batch_id": batch_id
+                })
+
+            # Emails go in before their batch so a claimed batch is never incomplete
+            inserted = await self.db.emails.insert_many(email_records)
+            for email_record in email_records:
+                self.rollup.record_insert(email_record)
+            await self.db.email_batches.insert_one({
+                "_id": batch_id,
+                "campaign_id": campaign_id,
+                "batch_index": batch_index,
+                "release_time": release_time,
+                "email_count": len(email_records),
+                "status": EmailStatus.SCHEDULED,
+                "created_at": now
+            })
+
+            for (result, _, _), email_id in zip(pending, inserted.inserted_ids):
+                result.update({
+                    "message": "Email scheduled successfully",
+                    "email_id": str(email_id),
+                    "status": EmailStatus.SCHEDULED,
+                    "scheduled_time": release_time,
+                    "batch_index": batch_index
                 })
+
+            logger.info(f"Scheduled batch {batch_index} of campaign {campaign_id} "
+                        f"({len(email_records)} emails) for {release_time}")
+            pending.clear()
+            batch_index += 1
+
+        for row in csv_data:
+            try:
+                recipient_email = self._get_recipient(row, recipient_column)
             except Exception as e:
                 results.append({
                     'status': 'error',
@@ -449,6 +1152,20 @@ class SESService:
                     'template_data': row.get('template_data', {}),
                     'error': str(e)
                 })
+                continue
+
+            result = {
+                'status': 'success',
+                'email': recipient_email,
+                'template_data': row['template_data']
+            }
+            results.append(result)
+            pending.append((result, row, recipient_email))
+            if len(pending) >= batch_size:
+                await flush_batch()
+
+        if pending:
+            await flush_batch()
 
         return results
     
@@ -0,0 +1,315 @@
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config import Settings
+from app.services.rate_limiter import AdaptiveRateLimiter
+from app.services.send_throttle import SendThrottle, error_code, is_throttling, is_transient
+from app.services.ses_templates import SESTemplateRegistry
+from app.services.ses_transport import SESTransport, create_ses_transport
+
+logger = logging.getLogger(__name__)
+
+# Ring points per shard of average weight
+RING_POINTS_PER_SHARD = 64
+
+# Destinations SES accepts in one SendEmail call
+SES_MAX_RECIPIENTS = 50
+
+
+class SESShard:
+    """
+    One sending identity: a sender address on an SES account and region.
+
+    Shards on the same account and region share one transport; the pool
+    gives them one send quota, throttle and template registry, since SES
+    applies those per account and region rather than per sender.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        transport: SESTransport,
+        sender_email: str,
+        max_send_rate: Optional[float] = None,
+        weight: Optional[float] = None
+    ):
+        self.name = name
+        self.transport = transport
+        self.sender_email = sender_email
+        self.max_send_rate = max_send_rate
+        # Recipients are spread in proportion to weight, which defaults to the send quota
+        self.weight = weight or max_send_rate or 1.0
+        # SES templates are per account and region; shared by the pool across such shards
+        self.templates = SESTemplateRegistry(transport)
+        # Built on first send, once the account's send quota is known
+        self.throttle: Optional[SendThrottle] = None
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.sent = 0
+        self.failed = 0
+
+    def is_healthy(self) -> bool:
+        return time.monotonic() >= self.unhealthy_until
+
+
+class SESShardPool:
+    """
+    Spreads SES sends over several sender shards.
+
+    Recipients are placed on a consistent-hash ring with points in
+    proportion to each shard's weight, so a recipient keeps the same sender
+    across campaigns and adding a shard only moves its share of recipients.
+    Shards are grouped into accounts by transport (one per account and
+    region); each account paces itself with its own adaptive throttle, so
+    aggregate throughput grows with the number of accounts.
+
+    A send that still fails transiently after the account's retries moves
+    on to the next shard on the ring. Throttling only spills over, and
+    skips other shards of the throttled account; other transient failures
+    count against the shard, and after `failure_threshold` in a row it is
+    skipped for `cooldown` seconds.
+    """
+
+    def __init__(
+        self,
+        shards: List[SESShard],
+        settings: Settings,
+        failure_threshold: int = 5,
+        cooldown: float = 30.0
+    ):
+        if not shards:
+            raise ValueError("At least one SES shard is required")
+        self.shards = shards
+        self.settings = settings
+        # Shards by SES account and region, keyed by their shared transport
+        self.accounts: Dict[SESTransport, List[SESShard]] = {}
+        for shard in shards:
+            self.accounts.setdefault(shard.transport, []).append(shard)
+        for account in self.accounts.values():
+            for shard in account[1:]:
+                shard.templates = account[0].templates
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        # Scheduler threads hand their sends to this loop, so they share its throttles
+        try:
+            self.loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self.loop = None
+
+        mean_weight = sum(shard.weight for shard in shards) / len(shards)
+        points = []
+        for shard in shards:
+            for i in range(max(1, round(RING_POINTS_PER_SHARD * shard.weight / mean_weight))):
+                points.append((self._hash(f"{shard.name}#{i}"), shard))
+        points.sort(key=lambda point: point[0])
+        self._ring_hashes = [point[0] for point in points]
+        self._ring_shards = [point[1] for point in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+    @property
+    def primary(self) -> SESShard:
+        return self.shards[0]
+
+    def candidates(self, routing_key: str) -> List[SESShard]:
+        """Every shard in ring order from the key's position, healthy shards first"""
+        if len(self.shards) == 1:
+            return self.shards
+        start = bisect.bisect(self._ring_hashes, self._hash(routing_key.lower()))
+        ordered: List[SESShard] = []
+        for i in range(len(self._ring_shards)):
+            shard = self._ring_shards[(start + i) % len(self._ring_shards)]
+            if shard not in ordered:
+                ordered.append(shard)
+                if len(ordered) == len(self.shards):
+                    break
+        return [shard for shard in ordered if shard.is_healthy()] + \
+               [shard for shard in ordered if not shard.is_healthy()]
+
+    def route(self, routing_key: str) -> SESShard:
+        return self.candidates(routing_key)[0]
+
+    @property
+    def transports(self) -> List[SESTransport]:
+        """One transport per SES account and region"""
+        return list(self.accounts)
+
+    async def get_max_send_rate(self, shard: SESShard) -> float:
+        """
+        The per-second quota of the shard's account, from its shards'
+        config, SES_MAX_SEND_RATE or SES GetSendQuota
+        """
+        configured = [other.max_send_rate for other in self.accounts[shard.transport] if other.max_send_rate]
+        if configured:
+            return max(configured)
+        if self.settings.SES_MAX_SEND_RATE > 0:
+            return self.settings.SES_MAX_SEND_RATE
+        try:
+            quota = await shard.transport.call('get_send_quota')
+            logger.info(f"Using SES MaxSendRate of {quota['MaxSendRate']}/s for shard {shard.name}")
+            return float(quota['MaxSendRate'])
+        except Exception as e:
+            # Sandbox accounts are limited to one email per second
+            logger.warning(f"Could not fetch SES send quota for shard {shard.name}, defaulting to 1/s: {str(e)}")
+            return 1.0
+
+    async def get_throttle(self, shard: SESShard) -> SendThrottle:
+        """Adaptive pacing shared by every send through the shard's account, bulk or single"""
+        if shard.throttle is None:
+            max_send_rate = await self.get_max_send_rate(shard)
+            if shard.throttle is None:
+                limiter = AdaptiveRateLimiter(
+                    max_send_rate,
+                    min_rate=self.settings.SES_RATE_MIN,
+                    increase=self.settings.SES_RATE_INCREASE,
+                    decrease_factor=self.settings.SES_RATE_DECREASE_FACTOR,
+                    # A send takes one token per destination, up to SES's per-call limit
+                    min_capacity=max(SES_MAX_RECIPIENTS, self.settings.SES_BULK_DESTINATIONS)
+                )
+                throttle = SendThrottle(
+                    limiter,
+                    max_attempts=self.settings.SES_SEND_MAX_ATTEMPTS,
+                    backoff_base=self.settings.SES_RETRY_BACKOFF_SECONDS
+                )
+                for other in self.accounts[shard.transport]:
+                    other.throttle = throttle
+        return shard.throttle
+
+    def _record_success(self, shard: SESShard, recipients: int):
+        shard.consecutive_failures = 0
+        shard.sent += recipients
+
+    def _record_failure(self, shard: SESShard, error: Exception):
+        shard.failed += 1
+        if is_throttling(error):
+            # A saturated shard is healthy; its throttle already slowed down
+            return
+        shard.consecutive_failures += 1
+        # Left at the threshold, so one more failure after the cooldown trips it again
+        if shard.consecutive_failures >= self.failure_threshold:
+            shard.unhealthy_until = time.monotonic() + self.cooldown
+            logger.warning(f"SES shard {shard.name} failed {shard.consecutive_failures} sends in a row "
+                           f"({error_code(error) or type(error).__name__}); skipping it for {self.cooldown:.0f}s")
+
+    async def send(
+        self,
+        operation: str,
+        routing_key: str,
+        request: Callable[[SESShard], Dict],
+        recipients: int = 1,
+        prepare: Optional[Callable[[SESShard], Awaitable[None]]] = None
+    ) -> Tuple[Dict, SESShard]:
+        """
+        Call an SES send operation on the recipient's shard, failing over
+        along the ring on transient errors.
+
+        `request` builds the operation's keyword arguments for a shard, since
+        the sender differs per shard; `prepare` runs first on each shard
+        tried. Raises the last error once every shard has failed, or the
+        first non-transient one.
+        """
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        last_error: Optional[Exception] = None
+        throttled = set()
+        for shard in self.candidates(routing_key):
+            if shard.transport in throttled:
+                # Same account quota; spill over to another account instead
+                continue
+            throttle = await self.get_throttle(shard)
+            try:
+                if prepare:
+                    await prepare(shard)
+                response = await throttle.call(
+                    lambda: shard.transport.call(operation, **request(shard)),
+                    cost=recipients
+                )
+            except Exception as e:
+                if not is_transient(e):
+                    raise
+                self._record_failure(shard, e)
+                if is_throttling(e):
+                    throttled.add(shard.transport)
+                last_error = e
+                continue
+            self._record_success(shard, recipients)
+            return response, shard
+        raise last_error
+
+    def send_sync(
+        self,
+        operation: str,
+        routing_key: str,
+        request: Callable[[SESShard], Dict],
+        recipients: int = 1
+    ) -> Tuple[Dict, SESShard]:
+        """
+        `send` for scheduler threads, blocking until it finishes.
+
+        The send runs on the pool's event loop, so scheduled emails are
+        paced, retried and failed over like every other send. Must not be
+        called from the loop's own thread.
+        """
+        if self.loop is None or self.loop.is_closed():
+            raise RuntimeError("SES shard pool has no event loop to send on")
+        future = asyncio.run_coroutine_threadsafe(
+            self.send(operation, routing_key, request, recipients=recipients),
+            self.loop
+        )
+        return future.result()
+
+    def close(self):
+        for transport in self.transports:
+            transport.close()
+
+
+def create_ses_shard_pool(settings: Settings) -> SESShardPool:
+    """
+    Build the sender pool from SES_SHARDS; without it, a single shard from
+    the AWS_* settings and SENDER_EMAIL.
+    """
+    configs = json.loads(settings.SES_SHARDS) if settings.SES_SHARDS.strip() else []
+    if not isinstance(configs, list):
+        raise ValueError("SES_SHARDS must be a JSON list of shard objects")
+
+    shards = []
+    # Shards on the same account and region share a transport, which groups them in the pool
+    transports: Dict[Tuple[str, Optional[str]], SESTransport] = {}
+    for i, config in enumerate(configs):
+        region = config.get("region") or settings.AWS_REGION
+        account = (region, config.get("access_key_id") or settings.AWS_ACCESS_KEY_ID)
+        if account not in transports:
+            transports[account] = create_ses_transport(
+                settings,
+                region=region,
+                access_key_id=config.get("access_key_id"),
+                secret_access_key=config.get("secret_access_key")
+            )
+        transport = transports[account]
+        shards.append(SESShard(
+            config.get("name") or f"{region}-{i}",
+            transport,
+            config.get("sender") or settings.SENDER_EMAIL,
+            max_send_rate=config.get("max_send_rate"),
+            weight=config.get("weight")
+        ))
+    if not shards:
+        shards.append(SESShard("default", create_ses_transport(settings), settings.SENDER_EMAIL))
+
+    names = [shard.name for shard in shards]
+    if len(set(names)) != len(names):
+        raise ValueError("SES_SHARDS names must be unique")
+    logger.info(f"SES sender shards: {', '.join(f'{shard.name} ({shard.sender_email})' for shard in shards)}")
+    return SESShardPool(
+        shards,
+        settings,
+        failure_threshold=settings.SES_SHARD_FAILURE_THRESHOLD,
+        cooldown=settings.SES_SHARD_COOLDOWN_SECONDS
+    )
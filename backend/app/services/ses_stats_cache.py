@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.services.ses_service import SESService
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_send_statistics(data_points: List[Dict]) -> Dict:
+    """Sum SES SendDataPoints into overall totals and delivery rates"""
+    totals = {
+        "total_delivery_attempts": 0,
+        "total_bounces": 0,
+        "total_complaints": 0,
+        "total_rejects": 0
+    }
+    for point in data_points:
+        totals["total_delivery_attempts"] += point["DeliveryAttempts"]
+        totals["total_bounces"] += point["Bounces"]
+        totals["total_complaints"] += point["Complaints"]
+        totals["total_rejects"] += point["Rejects"]
+
+    success_rate = bounce_rate = 0
+    if totals["total_delivery_attempts"] > 0:
+        successful_deliveries = (totals["total_delivery_attempts"] -
+                                 totals["total_bounces"] -
+                                 totals["total_rejects"])
+        success_rate = (successful_deliveries / totals["total_delivery_attempts"]) * 100
+        bounce_rate = (totals["total_bounces"] / totals["total_delivery_attempts"]) * 100
+
+    return {
+        **totals,
+        "success_rate": round(success_rate, 2),
+        "bounce_rate": round(bounce_rate, 2)
+    }
+
+
+class SESStatisticsCache:
+    """
+    Cached, pre-summed SES send statistics.
+
+    A background task refreshes the summary every `refresh_interval`
+    seconds. Reads never wait on AWS: once the summary is older than `ttl`
+    it is still returned while a refresh runs in the background
+    (stale-while-revalidate).
+    """
+
+    def __init__(self, ses_service: SESService, ttl: float = 900, refresh_interval: float = 300):
+        self.ses_service = ses_service
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._data_points: List[Dict] = []
+        self._summary: Dict = summarize_send_statistics([])
+        self._fetched_at: Optional[float] = None
+        self._updated_at: Optional[datetime] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._fetched_at is None or time.monotonic() - self._fetched_at > self.ttl
+
+    async def refresh(self):
+        try:
+            data_points = await self.ses_service.get_send_statistics()
+        except Exception as e:
+            logger.error(f"Failed to refresh SES statistics, serving cached data: {str(e)}")
+            return
+        self._data_points = data_points
+        self._summary = summarize_send_statistics(data_points)
+        self._fetched_at = time.monotonic()
+        self._updated_at = datetime.now(timezone.utc)
+
+    def _refresh_in_background(self):
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self.refresh())
+
+    def get_summary(self) -> Dict:
+        """Return the cached summary, triggering a background refresh if stale"""
+        if self.is_stale:
+            self._refresh_in_background()
+        return {**self._summary, "last_updated": self._updated_at}
+
+    def get_data_points(self) -> List[Dict]:
+        """Return the cached SES data points, triggering a background refresh if stale"""
+        if self.is_stale:
+            self._refresh_in_background()
+        return self._data_points
+
+    async def _refresh_loop(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        for task in (self._task, self._refreshing):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._refreshing = None
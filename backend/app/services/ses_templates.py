@@ -0,0 +1,60 @@
+import hashlib
+import json
+import logging
+from typing import Dict, List, Set
+
+from botocore.exceptions import ClientError
+
+from app.services.ses_transport import SESTransport
+from app.services.template_engine import CompiledTemplate
+
+logger = logging.getLogger(__name__)
+
+
+class SESBulkTemplate:
+    """
+    A `{Column}` subject/body template registered as an SES template.
+
+    Column names are aliased to `f0`, `f1`, ... because CSV headers are not
+    always valid Handlebars identifiers. `replacement_data` builds the
+    per-destination ReplacementTemplateData from a row.
+    """
+
+    def __init__(self, subject_template: str, body_template: str, placeholder_columns: List[str]):
+        self.columns = list(placeholder_columns)
+        self.aliases = {column: f"f{index}" for index, column in enumerate(self.columns)}
+        self.subject_part = CompiledTemplate(subject_template, self.columns).to_handlebars(self.aliases)
+        self.html_part = CompiledTemplate(body_template, self.columns).to_handlebars(self.aliases)
+
+        # Identical templates share one SES template across campaigns
+        digest = hashlib.sha256(f"{self.subject_part}\0{self.html_part}".encode('utf-8')).hexdigest()
+        self.name = f"bulk-{digest[:32]}"
+
+    def replacement_data(self, mapping: Dict[str, str]) -> str:
+        return json.dumps({self.aliases[column]: str(mapping[column]) for column in self.columns})
+
+
+class SESTemplateRegistry:
+    """Creates SES templates on first use and remembers which ones exist"""
+
+    def __init__(self, transport: SESTransport):
+        self.transport = transport
+        self._registered: Set[str] = set()
+
+    async def ensure(self, template: SESBulkTemplate):
+        if template.name in self._registered:
+            return
+        try:
+            await self.transport.call(
+                'create_template',
+                Template={
+                    'TemplateName': template.name,
+                    'SubjectPart': template.subject_part,
+                    'HtmlPart': template.html_part
+                }
+            )
+            logger.info(f"Registered SES template {template.name}")
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'AlreadyExists':
+                raise
+        self._registered.add(template.name)
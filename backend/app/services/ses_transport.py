@@ -0,0 +1,196 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+from app.config import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SESTransport:
+    """
+    Executes SES API operations without blocking the asyncio event loop.
+
+    Operations are named after the boto3 SES client methods
+    (e.g. 'send_email', 'get_send_statistics') and take the same keyword
+    arguments, returning the same response dicts.
+    """
+
+    def __init__(self, client, max_workers: int = 16):
+        self.client = client
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ses")
+
+    def call_sync(self, operation: str, **kwargs) -> Dict:
+        """Run an SES operation on the calling thread"""
+        return getattr(self.client, operation)(**kwargs)
+
+    async def call(self, operation: str, **kwargs) -> Dict:
+        """Run an SES operation on the transport's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.call_sync, operation, **kwargs)
+        )
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+class FakeSESClient:
+    """
+    Offline stand-in for the boto3 SES client.
+
+    Every call blocks for `latency` seconds like a real network round-trip,
+    which makes it suitable for benchmarking latency and throughput locally.
+    With `throttle_rate`, sends that would exceed that many recipients in
+    the last second fail with a Throttling error like SES's MaxSendRate.
+    """
+
+    def __init__(self, latency: float = 0.05, max_send_rate: float = 14.0, throttle_rate: float = 0):
+        self.latency = latency
+        self.max_send_rate = max_send_rate
+        self.throttle_rate = throttle_rate
+        self.throttled = 0
+        self.sent: List[Dict] = []
+        self.bulk_sent: List[Dict] = []
+        self.raw_sent: List[Dict] = []
+        self.templates: Dict[str, Dict] = {}
+        self.verified: List[str] = []
+        self._recent_sends = deque()
+        self._rate_lock = threading.Lock()
+
+    def _round_trip(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _check_rate(self, recipients: int, operation: str):
+        if self.throttle_rate <= 0:
+            return
+        with self._rate_lock:
+            now = time.monotonic()
+            while self._recent_sends and self._recent_sends[0] <= now - 1.0:
+                self._recent_sends.popleft()
+            if len(self._recent_sends) + recipients > self.throttle_rate:
+                self.throttled += 1
+                raise ClientError(
+                    {'Error': {'Code': 'Throttling', 'Message': 'Maximum sending rate exceeded.'}},
+                    operation
+                )
+            self._recent_sends.extend([now] * recipients)
+
+    def send_email(self, **kwargs) -> Dict:
+        self._round_trip()
+        self._check_rate(len(kwargs['Destination']['ToAddresses']), 'SendEmail')
+        self.sent.append(kwargs)
+        return {'MessageId': f"fake-{uuid.uuid4()}"}
+
+    def send_raw_email(self, **kwargs) -> Dict:
+        self._round_trip()
+        self._check_rate(len(kwargs['Destinations']), 'SendRawEmail')
+        self.raw_sent.append(kwargs)
+        return {'MessageId': f"fake-{uuid.uuid4()}"}
+
+    def create_template(self, Template: Dict) -> Dict:
+        self._round_trip()
+        if Template['TemplateName'] in self.templates:
+            raise ClientError(
+                {'Error': {'Code': 'AlreadyExists', 'Message': f"Template {Template['TemplateName']} already exists"}},
+                'CreateTemplate'
+            )
+        self.templates[Template['TemplateName']] = Template
+        return {}
+
+    def send_bulk_templated_email(self, **kwargs) -> Dict:
+        self._round_trip()
+        if kwargs['Template'] not in self.templates:
+            raise ClientError(
+                {'Error': {'Code': 'TemplateDoesNotExist', 'Message': f"Template {kwargs['Template']} does not exist"}},
+                'SendBulkTemplatedEmail'
+            )
+        self._check_rate(len(kwargs['Destinations']), 'SendBulkTemplatedEmail')
+        self.bulk_sent.append(kwargs)
+        return {
+            'Status': [
+                {'Status': 'Success', 'MessageId': f"fake-{uuid.uuid4()}"}
+                for _ in kwargs['Destinations']
+            ]
+        }
+
+    @property
+    def delivery_attempts(self) -> int:
+        return len(self.sent) + len(self.raw_sent) + sum(len(call['Destinations']) for call in self.bulk_sent)
+
+    def verify_email_identity(self, EmailAddress: str) -> Dict:
+        self._round_trip()
+        self.verified.append(EmailAddress)
+        return {}
+
+    def get_send_statistics(self) -> Dict:
+        self._round_trip()
+        return {
+            'SendDataPoints': [{
+                'Timestamp': datetime.now(timezone.utc),
+                'DeliveryAttempts': self.delivery_attempts,
+                'Bounces': 0,
+                'Complaints': 0,
+                'Rejects': 0
+            }]
+        }
+
+    def get_send_quota(self) -> Dict:
+        self._round_trip()
+        return {
+            'Max24HourSend': 50000.0,
+            'MaxSendRate': self.max_send_rate,
+            'SentLast24Hours': float(self.delivery_attempts)
+        }
+
+
+def create_ses_client(
+    settings: Settings,
+    region: Optional[str] = None,
+    access_key_id: Optional[str] = None,
+    secret_access_key: Optional[str] = None
+):
+    """
+    Build the SES client selected by SES_TRANSPORT ('boto3' or 'fake').
+
+    The region and credentials default to the AWS_* settings; sender shards
+    pass their own.
+    """
+    if settings.SES_TRANSPORT == "fake":
+        logger.info("Using fake SES client")
+        return FakeSESClient(
+            latency=settings.SES_FAKE_LATENCY_MS / 1000,
+            throttle_rate=settings.SES_FAKE_THROTTLE_RATE
+        )
+
+    session = boto3.Session(
+        aws_access_key_id=access_key_id or settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=secret_access_key or settings.AWS_SECRET_ACCESS_KEY,
+        region_name=region or settings.AWS_REGION
+    )
+    # boto3 clients are thread-safe, so one pooled client serves every request and scheduler thread.
+    # botocore's own retries are off so Throttling reaches SendThrottle, which adapts the send rate.
+    return session.client(
+        'ses',
+        config=Config(
+            max_pool_connections=settings.SES_MAX_POOL_CONNECTIONS,
+            retries={'mode': 'standard', 'total_max_attempts': 1}
+        )
+    )
+
+
+def create_ses_transport(settings: Settings, **client_options) -> SESTransport:
+    return SESTransport(create_ses_client(settings, **client_options), max_workers=settings.SES_EXECUTOR_WORKERS)
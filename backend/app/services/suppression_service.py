@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+from app.models.schemas import SuppressionReason
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_email(address) -> str:
+    return str(address).strip().lower()
+
+
+class SuppressionList:
+    """
+    Addresses that must not be emailed: past bounces, complaints and
+    unsubscribes.
+
+    The `suppressions` collection (keyed by normalized address) is the
+    source of truth; it is loaded into an in-memory set on startup so bulk
+    sends can check every row in O(1) without a database round-trip.
+    Other worker processes change the collection too, so bulk sends call
+    `refresh` to reload the set once it is older than `max_age` seconds.
+    """
+
+    def __init__(self, db, max_age: float = 30.0):
+        self.db = db
+        self.max_age = max_age
+        self._addresses: Set[str] = set()
+        self._loaded_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._addresses)
+
+    def __contains__(self, address) -> bool:
+        return normalize_email(address) in self._addresses
+
+    async def load(self):
+        addresses = set()
+        async for doc in self.db.suppressions.find({}, {"_id": 1}):
+            addresses.add(doc["_id"])
+        self._addresses = addresses
+        self._loaded_at = time.monotonic()
+        logger.info(f"Loaded {len(addresses)} suppressed addresses")
+
+    async def refresh(self):
+        """Reload the set if it is older than `max_age`"""
+        async with self._refresh_lock:
+            # Concurrent bulk sends share one reload
+            if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.max_age:
+                await self.load()
+
+    async def add(self, address: str, reason: SuppressionReason, details: Optional[str] = None) -> Dict:
+        address = normalize_email(address)
+        doc = {
+            "_id": address,
+            "reason": SuppressionReason(reason),
+            "details": details,
+            "created_at": datetime.now(timezone.utc)
+        }
+        await self.db.suppressions.replace_one({"_id": address}, doc, upsert=True)
+        self._addresses.add(address)
+        return doc
+
+    async def remove(self, address: str) -> bool:
+        address = normalize_email(address)
+        result = await self.db.suppressions.delete_one({"_id": address})
+        self._addresses.discard(address)
+        return result.deleted_count > 0
+
+
+class RecipientFilter:
+    """
+    Drops duplicate and suppressed recipients from a stream of CSV rows.
+
+    Rows are filtered lazily as the sender pulls them; rows without a usable
+    recipient are passed through so the sender reports them as errors.
+    """
+
+    def __init__(self, suppressions: SuppressionList, recipient_column: str):
+        self.suppressions = suppressions
+        self.recipient_column = recipient_column
+        self.duplicates = 0
+        self.suppressed = 0
+        self._seen: Set[str] = set()
+
+    def apply(self, rows: Iterable[Dict]) -> Iterator[Dict]:
+        for row in rows:
+            recipient = row.get(self.recipient_column)
+            if not recipient:
+                yield row
+                continue
+            address = normalize_email(recipient)
+            if address in self._seen:
+                self.duplicates += 1
+                continue
+            self._seen.add(address)
+            if address in self.suppressions:
+                self.suppressed += 1
+                continue
+            yield row
+
+    def summary(self) -> Dict:
+        return {"duplicates": self.duplicates, "suppressed": self.suppressed}
@@ -0,0 +1,97 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from app.services.llm_service import generate_email_template
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTemplateCache:
+    """
+    Caches LLM-generated email templates per (situation, keywords, columns).
+
+    Lookups hit an in-process LRU first and then the `llm_templates`
+    collection (expired by a TTL index, see Database.ensure_indexes), so
+    reruns of the same campaign skip the LLM entirely.
+    Concurrent misses for the same key share a single LLM call.
+    """
+
+    def __init__(self, db, max_entries: int = 256, ttl_hours: float = 168):
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl = timedelta(hours=ttl_hours)
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def make_key(situation: str, keywords: List[str], columns: List[str]) -> str:
+        payload = json.dumps(
+            {"situation": situation, "keywords": list(keywords), "columns": sorted(columns)},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _remember(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        created_at = entry["created_at"]
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - created_at < self.ttl
+
+    async def _load(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry and self._is_fresh(entry):
+            self._entries.move_to_end(key)
+            return entry
+
+        entry = await self.db.llm_templates.find_one({"_id": key})
+        if entry and self._is_fresh(entry):
+            self._remember(key, entry)
+            return entry
+        return None
+
+    async def get_or_generate(
+        self,
+        situation: str,
+        keywords: List[str],
+        columns: List[str]
+    ) -> Dict[str, str]:
+        """Return the cached template for these inputs, generating it on a miss"""
+        key = self.make_key(situation, keywords, columns)
+
+        entry = await self._load(key)
+        if entry:
+            return entry["template"]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another request may have generated it while we waited
+            entry = await self._load(key)
+            if entry:
+                return entry["template"]
+
+            logger.info(f"LLM template cache miss for {key[:12]}, generating")
+            template = await generate_email_template(situation, keywords, columns)
+            entry = {
+                "_id": key,
+                "situation": situation,
+                "keywords": list(keywords),
+                "columns": sorted(columns),
+                "template": template,
+                "created_at": datetime.now(timezone.utc)
+            }
+            await self.db.llm_templates.replace_one({"_id": key}, entry, upsert=True)
+            self._remember(key, entry)
+
+        self._locks.pop(key, None)
+        return template
@@ -0,0 +1,71 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+
+class CompiledTemplate:
+    """
+    A `{Column}` template parsed once into literal and placeholder segments.
+
+    Rendering a row is a single join over the segment list instead of one
+    str.replace pass per placeholder.
+    """
+
+    def __init__(self, template: str, placeholders: Optional[Iterable[str]] = None):
+        """
+        Args:
+            template: Template text with `{Column}` placeholders
+            placeholders: Names to substitute; other braces are kept literally.
+                Defaults to every placeholder found in the template.
+        """
+        allowed = set(placeholders) if placeholders is not None else None
+        self.template = template
+        self.segments: List[Tuple[bool, str]] = []
+
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(template):
+            name = match.group(1)
+            if allowed is not None and name not in allowed:
+                continue
+            self.segments.append((False, template[position:match.start()]))
+            self.segments.append((True, name))
+            position = match.end()
+        self.segments.append((False, template[position:]))
+
+        # Drop empty literals; `_parts` is the join buffer and `_slots` the indexes to fill
+        self.segments = [(is_field, text) for is_field, text in self.segments if is_field or text]
+        self._parts = [text for _, text in self.segments]
+        self._slots = [(index, text) for index, (is_field, text) in enumerate(self.segments) if is_field]
+
+    @property
+    def fields(self) -> List[str]:
+        return [name for _, name in self._slots]
+
+    def render(self, mapping: Dict[str, str]) -> str:
+        parts = self._parts.copy()
+        for index, name in self._slots:
+            parts[index] = mapping[name]
+        return "".join(parts)
+
+    def to_handlebars(self, aliases: Dict[str, str]) -> str:
+        """
+        Rewrite the template in SES (Handlebars) syntax.
+
+        Placeholders become `{{{alias}}}` so values are substituted without
+        HTML escaping, matching `render`. Literal `{{` is escaped. Raises
+        ValueError for text Handlebars cannot keep literal: a brace or
+        backslash touching a placeholder, e.g. `{{Name}}`, or a literal `\\{{`.
+        """
+        parts = []
+        for index, (is_field, text) in enumerate(self.segments):
+            if is_field:
+                parts.append("{{{" + aliases[text] + "}}}")
+                continue
+            # Literals and fields alternate, so neighbouring segments are fields
+            touches_next = index + 1 < len(self.segments) and text.endswith(("{", "\\"))
+            touches_previous = index > 0 and text.startswith("}")
+            if "\\{{" in text or touches_next or touches_previous:
+                raise ValueError(f"Template cannot be converted to Handlebars near {text!r}")
+            parts.append(text.replace("{{", "\\{{"))
+        return "".join(parts)
@@ -0,0 +1,103 @@
+"""
+Compare a fixed-rate token bucket with the adaptive send throttle against a
+fake SES client that throttles.
+
+The configured quota is set above the rate the fake SES accepts, as when
+SES_MAX_SEND_RATE is stale or other senders share the account. The fixed
+bucket loses every throttled send; the adaptive throttle backs off,
+retries and converges on the accepted rate.
+
+Run from the backend directory:
+    python -m benchmarks.bench_adaptive_rate --emails 2000 --quota 200 --accepted-rate 100
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from botocore.exceptions import ClientError
+
+from app.services.rate_limiter import AdaptiveRateLimiter, TokenBucket
+from app.services.send_throttle import SendThrottle
+from app.services.ses_transport import FakeSESClient, SESTransport
+
+
+def send_kwargs(i: int):
+    return {
+        'Source': 'sender@example.com',
+        'Destination': {'ToAddresses': [f"user{i}@example.com"]},
+        'Message': {
+            'Subject': {'Data': f"Hello {i}", 'Charset': 'UTF-8'},
+            'Body': {'Html': {'Data': "<p>Hi</p>", 'Charset': 'UTF-8'}}
+        }
+    }
+
+
+async def run(emails: int, concurrency: int, send) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def one(i):
+        nonlocal failed
+        async with semaphore:
+            try:
+                await send(i)
+            except ClientError:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(emails)))
+    return time.perf_counter() - start, failed
+
+
+async def bench_fixed(args, latency: float):
+    client = FakeSESClient(latency=latency, throttle_rate=args.accepted_rate)
+    transport = SESTransport(client, max_workers=args.concurrency)
+    bucket = TokenBucket(args.quota)
+
+    async def send(i):
+        await bucket.acquire()
+        await transport.call('send_email', **send_kwargs(i))
+
+    elapsed, failed = await run(args.emails, args.concurrency, send)
+    transport.close()
+    print(f"fixed bucket     {elapsed:6.1f}s  sent {len(client.sent):6d}  lost {failed:6d}  "
+          f"throttled calls {client.throttled:6d}")
+
+
+async def bench_adaptive(args, latency: float):
+    client = FakeSESClient(latency=latency, throttle_rate=args.accepted_rate)
+    transport = SESTransport(client, max_workers=args.concurrency)
+    limiter = AdaptiveRateLimiter(args.quota, increase=args.increase, decrease_factor=args.decrease_factor)
+    throttle = SendThrottle(limiter, max_attempts=args.max_attempts)
+
+    async def send(i):
+        await throttle.call(lambda: transport.call('send_email', **send_kwargs(i)))
+
+    elapsed, failed = await run(args.emails, args.concurrency, send)
+    transport.close()
+    print(f"adaptive (AIMD)  {elapsed:6.1f}s  sent {len(client.sent):6d}  lost {failed:6d}  "
+          f"throttled calls {client.throttled:6d}  final rate {throttle.limiter.rate:.0f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--quota", type=float, default=200, help="configured max send rate")
+    parser.add_argument("--accepted-rate", type=float, default=100, help="rate the fake SES accepts")
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-attempts", type=int, default=4)
+    parser.add_argument("--increase", type=float, default=0, help="additive increase per second; 0 for the default")
+    parser.add_argument("--decrease-factor", type=float, default=0.5)
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    logging.disable(logging.WARNING)
+    print(f"{args.emails} emails, quota {args.quota:.0f}/s, SES accepts {args.accepted_rate:.0f}/s")
+    asyncio.run(bench_fixed(args, latency))
+    asyncio.run(bench_adaptive(args, latency))
+
+
+if __name__ == "__main__":
+    main()
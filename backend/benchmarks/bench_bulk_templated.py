@@ -0,0 +1,153 @@
+"""
+Compare per-recipient SendEmail with SendBulkTemplatedEmail against the fake SES client.
+
+Counts SES API calls and wall time for sending one rendered template to
+every row, without MongoDB or AWS. First checks that templates with
+literal braces either render like CompiledTemplate under a small model of
+the Handlebars lexer, or are rejected for the per-recipient fallback.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_templated --rows 5000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import re
+import time
+
+from app.services.ses_templates import SESBulkTemplate, SESTemplateRegistry
+from app.services.ses_transport import FakeSESClient, SESTransport
+from app.services.template_engine import CompiledTemplate
+
+BODY = "<p>Dear {Name}, welcome to {Company}. We're excited to have you join us.</p>"
+SUBJECT = "Welcome to {Company}, {Name}!"
+COLUMNS = ["Name", "Company"]
+
+# Literal braces and backslashes around and between placeholders
+PARITY_TEMPLATES = [
+    BODY,
+    "{{Name}} and {Company} {{x}}",
+    "{Name} and {Company} {{x}} }}",
+    "a{ {Name} }b",
+    "{Name}}",
+    "{{{Name}",
+    "\\{Name}",
+    "\\{{x}} {Name}",
+    "{Name}{Company}",
+    "{{ {Company} }}",
+]
+
+# Handlebars tokens: escaped mustache, raw block, triple-stash and any other mustache
+HANDLEBARS_TOKEN = re.compile(r"\\\{\{|\{\{\{\{|\{\{\{(\w+)\}\}\}|\{\{")
+
+
+def make_rows(count: int):
+    return [{"Email": f"user{i}@example.com", "Name": f"User {i}", "Company": "Acme"} for i in range(count)]
+
+
+def render_handlebars(template: str, data: dict) -> str:
+    """Render the subset of Handlebars that to_handlebars emits; raises on anything else"""
+    out = []
+    position = 0
+    while True:
+        match = HANDLEBARS_TOKEN.search(template, position)
+        if match is None:
+            out.append(template[position:])
+            return "".join(out)
+        out.append(template[position:match.start()])
+        token = match.group(0)
+        if token == "\\{{":
+            # Escaped: `{{` and the text up to the next mustache stay literal
+            following = HANDLEBARS_TOKEN.search(template, match.end())
+            position = following.start() if following else len(template)
+            out.append("{{" + template[match.end():position])
+        elif match.group(1):
+            out.append(data[match.group(1)])
+            position = match.end()
+        else:
+            raise ValueError(f"Unexpected Handlebars token {token!r} at {match.start()}")
+
+
+def check_parity():
+    row = {"Name": "Ada", "Company": "Acme"}
+    for body in PARITY_TEMPLATES:
+        try:
+            template = SESBulkTemplate(SUBJECT, body, COLUMNS)
+        except ValueError:
+            print(f"per-recipient fallback    {body!r}")
+            continue
+        data = {template.aliases[column]: row[column] for column in COLUMNS}
+        rendered = render_handlebars(template.html_part, data)
+        assert rendered == CompiledTemplate(body, COLUMNS).render(row), f"SES template differs for {body!r}"
+
+
+async def bench_individual(rows, transport: SESTransport, concurrency: int) -> float:
+    body = CompiledTemplate(BODY, COLUMNS)
+    subject = CompiledTemplate(SUBJECT, COLUMNS)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(row):
+        async with semaphore:
+            await transport.call(
+                'send_email',
+                Source='sender@example.com',
+                Destination={'ToAddresses': [row["Email"]]},
+                Message={
+                    'Subject': {'Data': subject.render(row), 'Charset': 'UTF-8'},
+                    'Body': {'Html': {'Data': body.render(row), 'Charset': 'UTF-8'}}
+                }
+            )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(row) for row in rows))
+    return time.perf_counter() - start
+
+
+async def bench_bulk(rows, transport: SESTransport, concurrency: int, destinations: int) -> float:
+    template = SESBulkTemplate(SUBJECT, BODY, COLUMNS)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(chunk):
+        async with semaphore:
+            await transport.call(
+                'send_bulk_templated_email',
+                Source='sender@example.com',
+                Template=template.name,
+                DefaultTemplateData='{}',
+                Destinations=[
+                    {'Destination': {'ToAddresses': [row["Email"]]}, 'ReplacementTemplateData': template.replacement_data(row)}
+                    for row in chunk
+                ]
+            )
+
+    start = time.perf_counter()
+    await SESTemplateRegistry(transport).ensure(template)
+    await asyncio.gather(*(send(rows[i:i + destinations]) for i in range(0, len(rows), destinations)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--destinations", type=int, default=50)
+    args = parser.parse_args()
+    check_parity()
+    rows = make_rows(args.rows)
+    latency = args.latency_ms / 1000
+
+    client = FakeSESClient(latency=latency)
+    transport = SESTransport(client, max_workers=args.concurrency)
+    elapsed = asyncio.run(bench_individual(rows, transport, args.concurrency))
+    transport.close()
+    print(f"send_email per row        {elapsed:8.2f}s  {len(client.sent):6d} API calls")
+
+    client = FakeSESClient(latency=latency)
+    transport = SESTransport(client, max_workers=args.concurrency)
+    elapsed = asyncio.run(bench_bulk(rows, transport, args.concurrency, args.destinations))
+    transport.close()
+    print(f"send_bulk_templated_email {elapsed:8.2f}s  {len(client.bulk_sent) + 1:6d} API calls")
+
+
+if __name__ == "__main__":
+    main()
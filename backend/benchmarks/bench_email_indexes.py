@@ -0,0 +1,134 @@
+"""
+Seed an emails collection and verify the hot queries are index-backed.
+
+Creates the application's indexes (see app.database.get_index_models),
+explains each hot query with executionStats and fails if any of them
+falls back to a collection scan.
+
+Run from the backend directory against a scratch database:
+    python -m benchmarks.bench_email_indexes --documents 2000000 --db email_sender_bench
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from bson.objectid import ObjectId
+from pymongo import MongoClient
+
+from app.config import settings
+from app.database import get_index_models
+
+STATUSES = ["SENT", "SENT", "SENT", "FAILED", "PENDING", "SCHEDULED"]
+
+
+def seed(database, documents: int, chunk: int = 10_000):
+    now = datetime.now(timezone.utc)
+    campaigns = [str(ObjectId()) for _ in range(100)]
+    inserted = 0
+    while inserted < documents:
+        batch = []
+        for i in range(min(chunk, documents - inserted)):
+            status = random.choice(STATUSES)
+            created_at = now - timedelta(minutes=random.randint(0, 60 * 24 * 180))
+            record = {
+                "recipient_emails": [f"user{inserted + i}@example.com"],
+                "subject": "Benchmark",
+                "body_html": "<p>Hello</p>",
+                "status": status,
+                "created_at": created_at,
+                "campaign_id": random.choice(campaigns)
+            }
+            if status == "SENT":
+                record["message_id"] = f"msg-{inserted + i}"
+                record["sent_at"] = created_at
+            if status == "SCHEDULED":
+                record["scheduled_time"] = now + timedelta(minutes=random.randint(-60, 60 * 24))
+            batch.append(record)
+        database.emails.insert_many(batch, ordered=False)
+        inserted += len(batch)
+        print(f"\rseeded {inserted}/{documents}", end="", flush=True)
+    print()
+    return campaigns
+
+
+def plan_stages(plan: dict) -> set:
+    stages = {plan.get("stage")}
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages |= plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= plan_stages(child)
+    return stages
+
+
+def explain(database, collection: str, query: dict, sort: dict = None, limit: int = 0) -> dict:
+    command = {"find": collection, "filter": query}
+    if sort:
+        command["sort"] = sort
+    if limit:
+        command["limit"] = limit
+    return database.command("explain", command, verbosity="executionStats")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=1_000_000)
+    parser.add_argument("--db", default="email_sender_bench")
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    client = MongoClient(settings.MONGODB_URL)
+    database = client[args.db]
+
+    if not args.skip_seed:
+        database.emails.drop()
+        campaigns = seed(database, args.documents)
+    else:
+        campaigns = database.emails.distinct("campaign_id")
+
+    for collection, models in get_index_models().items():
+        database[collection].create_indexes(models)
+
+    now = datetime.now(timezone.utc)
+    sample = database.emails.find_one({"status": "SENT"})
+    queries = [
+        ("scheduler claim", "emails", {
+            "status": "SCHEDULED",
+            "scheduled_time": {"$lte": now},
+            "batch_id": None,
+            "$or": [{"lease_expires_at": None}, {"lease_expires_at": {"$lte": now}}]
+        }, {"scheduled_time": 1}, 1),
+        ("batch claim", "email_batches", {
+            "status": "SCHEDULED",
+            "release_time": {"$lte": now}
+        }, {"release_time": 1}, 1),
+        ("email status by _id", "emails", {"_id": sample["_id"]}, None, 1),
+        ("lookup by message_id", "emails", {"message_id": sample["message_id"]}, None, 1),
+        ("created_at range", "emails", {"created_at": {"$gte": now - timedelta(days=1)}}, None, 0),
+        ("campaign emails", "emails", {"campaign_id": campaigns[0]}, None, 0),
+        ("campaign failures", "emails", {"campaign_id": campaigns[0], "status": "FAILED"}, None, 0),
+    ]
+
+    failures = 0
+    print(f"{'query':<24} {'plan':<28} {'keys':>10} {'docs':>10} {'returned':>10} {'ms':>8}")
+    for name, collection, query, sort, limit in queries:
+        start = time.perf_counter()
+        result = explain(database, collection, query, sort, limit)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        stages = plan_stages(result["queryPlanner"]["winningPlan"])
+        stats = result["executionStats"]
+        indexed = "COLLSCAN" not in stages
+        failures += not indexed
+        print(f"{name:<24} {'+'.join(sorted(s for s in stages if s)):<28} "
+              f"{stats['totalKeysExamined']:>10} {stats['totalDocsExamined']:>10} "
+              f"{stats['nReturned']:>10} {elapsed:>8.1f}{'' if indexed else '  <-- COLLSCAN'}")
+
+    client.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Load-test LLMClient throughput against the local stub provider.
+
+Run from the backend directory:
+    python -m benchmarks.bench_llm_client --requests 200 --latency-ms 500
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.llm_client import LLMClient, StubLLMProvider
+
+MESSAGES = [{"role": "user", "content": "Write a welcome email"}]
+
+
+async def bench(requests: int, latency: float, concurrency: int) -> float:
+    client = LLMClient(StubLLMProvider(latency=latency), max_concurrency=concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*(client.complete(MESSAGES) for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        elapsed = asyncio.run(bench(args.requests, args.latency_ms / 1000, concurrency))
+        print(f"concurrency {concurrency:<4} {elapsed:8.2f}s  {args.requests / elapsed:8.1f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure per-message serialization cost of the SES send paths.
+
+Compares building the SendEmail Message dict (serialized by botocore) with
+building a MIME message per recipient using the stdlib email package, and
+with splicing recipients into a RawMessageTemplate skeleton. Each path is
+timed up to the serialized API request body; nothing is sent.
+
+Run from the backend directory:
+    python -m benchmarks.bench_raw_mime --messages 20000
+"""
+import argparse
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import boto3
+from botocore.serialize import create_serializer
+
+from app.services.mime_builder import RawMessageTemplate
+from app.services.ses_service import SESService
+from app.services.template_engine import CompiledTemplate
+
+SENDER = "sender@example.com"
+SUBJECT = "Welcome to {Company}, {Name}!"
+BODY = "<p>Dear {Name}, welcome to {Company}.</p>" + "<p>We're excited to have you join us.</p>" * 40
+TEXT = "Dear {Name}, welcome to {Company}."
+COLUMNS = ["Name", "Company"]
+
+
+def make_rows(count: int):
+    return [{"Email": f"user{i}@example.com", "Name": f"User {i}", "Company": "Acme"} for i in range(count)]
+
+
+def timed(rows, build) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        build(row)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+    rows = make_rows(args.messages)
+
+    client = boto3.client('ses', region_name='us-east-1', aws_access_key_id='x', aws_secret_access_key='x')
+    serializer = create_serializer('query')
+    send_email = client.meta.service_model.operation_model('SendEmail')
+    send_raw_email = client.meta.service_model.operation_model('SendRawEmail')
+
+    subject = CompiledTemplate(SUBJECT, COLUMNS)
+    body = CompiledTemplate(BODY, COLUMNS)
+    text = CompiledTemplate(TEXT, COLUMNS)
+
+    def message_dict(row):
+        serializer.serialize_to_request({
+            'Source': SENDER,
+            'Destination': {'ToAddresses': [row["Email"]]},
+            'Message': SESService._build_message(subject.render(row), body.render(row), text.render(row))
+        }, send_email)
+
+    def stdlib_mime(row):
+        message = MIMEMultipart('alternative')
+        message['From'] = SENDER
+        message['To'] = row["Email"]
+        message['Subject'] = subject.render(row)
+        message.attach(MIMEText(text.render(row), 'plain', 'utf-8'))
+        message.attach(MIMEText(body.render(row), 'html', 'utf-8'))
+        serializer.serialize_to_request({
+            'Source': SENDER,
+            'Destinations': [row["Email"]],
+            'RawMessage': {'Data': message.as_bytes()}
+        }, send_raw_email)
+
+    skeleton = RawMessageTemplate(SENDER, subject, body, text)
+
+    def raw_skeleton(row):
+        serializer.serialize_to_request({
+            'Source': SENDER,
+            'Destinations': [row["Email"]],
+            'RawMessage': {'Data': skeleton.render(row["Email"], row)}
+        }, send_raw_email)
+
+    def raw_skeleton_only(row):
+        skeleton.render(row["Email"], row)
+
+    for name, build in (
+        ("SendEmail message dict", message_dict),
+        ("SendRawEmail, stdlib MIME", stdlib_mime),
+        ("SendRawEmail, skeleton", raw_skeleton),
+        ("skeleton render only", raw_skeleton_only),
+    ):
+        elapsed = timed(rows, build)
+        print(f"{name:28} {elapsed:8.2f}s  {elapsed / len(rows) * 1e6:8.1f} us/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure SES send throughput as sender shards are added.
+
+Each shard is a fake SES client that accepts `--rate` sends per second and
+answers Throttling above it, as a separate account or region with its own
+MaxSendRate would. Sends go through SESShardPool with `--emails-per-shard`
+emails per shard, so every run has the same per-shard load and throughput
+should grow close to linearly with the shard count. With --fail-shard, the first shard
+answers ServiceUnavailable and its recipients fail over to the others.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ses_shards --emails-per-shard 1500 --rate 100 --shards 1 2 4
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.services.ses_shards import SESShard, SESShardPool
+from app.services.ses_transport import FakeSESClient, SESTransport
+
+
+def unavailable(**kwargs):
+    raise ClientError({'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service unavailable'}}, 'SendEmail')
+
+
+def build_pool(shards: int, args, latency: float) -> SESShardPool:
+    pool = []
+    for i in range(shards):
+        client = FakeSESClient(latency=latency, throttle_rate=args.rate)
+        if args.fail_shard and i == 0:
+            client.send_email = unavailable
+        pool.append(SESShard(
+            f"shard-{i}",
+            SESTransport(client, max_workers=args.concurrency),
+            f"sender{i}@example.com",
+            max_send_rate=args.quota or args.rate
+        ))
+    return SESShardPool(pool, settings, failure_threshold=3, cooldown=60)
+
+
+async def bench(shards: int, args, latency: float):
+    pool = build_pool(shards, args, latency)
+    emails = args.emails_per_shard * shards
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async def one(i):
+        nonlocal failed
+        recipient = f"user{i}@example.com"
+        async with semaphore:
+            try:
+                await pool.send('send_email', recipient, lambda shard: {
+                    'Source': shard.sender_email,
+                    'Destination': {'ToAddresses': [recipient]},
+                    'Message': {
+                        'Subject': {'Data': f"Hello {i}", 'Charset': 'UTF-8'},
+                        'Body': {'Html': {'Data': "<p>Hi</p>", 'Charset': 'UTF-8'}}
+                    }
+                })
+            except ClientError:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(emails)))
+    elapsed = time.perf_counter() - start
+    pool.close()
+
+    per_shard = " ".join(f"{shard.sent}" for shard in pool.shards)
+    print(f"{shards} shard(s)  {elapsed:6.1f}s  {(emails - failed) / elapsed:7.1f} sends/s  "
+          f"lost {failed:5d}  per shard [{per_shard}]")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails-per-shard", type=int, default=1500)
+    parser.add_argument("--rate", type=float, default=100, help="sends per second each shard accepts")
+    parser.add_argument("--quota", type=float, default=0, help="configured max send rate per shard; 0 for --rate")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--fail-shard", action="store_true", help="make the first shard unavailable")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    logging.disable(logging.WARNING)
+    print(f"{args.emails_per_shard} emails per shard, each shard accepts {args.rate:.0f}/s")
+    for shards in args.shards:
+        asyncio.run(bench(shards, args, latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark SES send throughput through SESTransport against the fake SES client.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ses_transport --emails 500 --latency-ms 50
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.ses_transport import FakeSESClient, SESTransport
+
+
+def send_kwargs(index: int) -> dict:
+    return {
+        'Source': 'sender@example.com',
+        'Destination': {'ToAddresses': [f"user{index}@example.com"]},
+        'Message': {
+            'Subject': {'Data': 'Benchmark', 'Charset': 'UTF-8'},
+            'Body': {'Html': {'Data': '<p>Hello</p>', 'Charset': 'UTF-8'}}
+        }
+    }
+
+
+def bench_blocking(emails: int, latency: float) -> float:
+    """Baseline: boto3-style calls made directly, one after another"""
+    client = FakeSESClient(latency=latency)
+    start = time.perf_counter()
+    for i in range(emails):
+        client.send_email(**send_kwargs(i))
+    return time.perf_counter() - start
+
+
+async def bench_transport(emails: int, latency: float, workers: int) -> float:
+    transport = SESTransport(FakeSESClient(latency=latency), max_workers=workers)
+    start = time.perf_counter()
+    await asyncio.gather(*(transport.call('send_email', **send_kwargs(i)) for i in range(emails)))
+    elapsed = time.perf_counter() - start
+    transport.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--emails", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+
+    elapsed = bench_blocking(args.emails, latency)
+    print(f"blocking            {elapsed:8.2f}s  {args.emails / elapsed:10.1f} emails/s")
+
+    for workers in args.workers:
+        elapsed = asyncio.run(bench_transport(args.emails, latency, workers))
+        print(f"transport x{workers:<7} {elapsed:8.2f}s  {args.emails / elapsed:10.1f} emails/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,4 +54,54 @@ export const fetchAnalytics = async () => {
         throw error;
     }
 };
+export const fetchTimeSeries = async ({ start, end, granularity = 'hour' } = {}) => {
+    const params = new URLSearchParams({ granularity });
+    if (start) params.append('start', start);
+    if (end) params.append('end', end);
+
+    const response = await fetch(`${API_URL}/analytics/time-series?${params}`);
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return await response.json();
+};
+
+// Turn the columnar time-series response into one row per bucket for recharts
+export const toChartRows = (series) =>
+    series.timestamps.map((timestamp, i) => ({
+        timestamp,
+        sent: series.sent[i],
+        failed: series.failed[i],
+        bounces: series.bounces[i]
+    }));
+
+// Bulk sends run as background campaigns; these return { campaign_id, status }
+export const submitBulkCampaign = async (params, formData) => {
+    const response = await fetch(`${API_URL}/campaigns/send-bulk-emails?${params}`, {
+        method: 'POST',
+        body: formData
+    });
+    if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Failed to start campaign');
+    }
+    return await response.json();
+};
+
+export const submitGenerateAndSendBulkCampaign = async (formData) => {
+    const response = await axios.post(`${API_URL}/campaigns/generate-and-send-bulk`, formData);
+    return response.data;
+};
+
+// Follow a campaign's server-sent progress events; returns a function that stops listening
+export const watchCampaign = (campaignId, onProgress, onDone) => {
+    const source = new EventSource(`${API_URL}/campaigns/${campaignId}/events`);
+    source.addEventListener('progress', (e) => onProgress(JSON.parse(e.data)));
+    source.addEventListener('done', (e) => {
+        source.close();
+        onDone(JSON.parse(e.data));
+    });
+    return () => source.close();
+};
+
 // Add other API functions as needed
\ No newline at end of file
@@ -1,8 +1,8 @@
 import React, { useEffect, useState } from 'react';
 import styled from 'styled-components';
-import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
+import { BarChart, Bar, LineChart, Line, Legend, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer } from 'recharts';
 import { Activity, Clock, CheckCircle, XCircle } from 'lucide-react';
-import { fetchAnalytics } from '../api';
+import { fetchAnalytics, fetchTimeSeries, toChartRows } from '../api';
 
 const Container = styled.div`
   padding: 24px;
@@ -136,6 +136,7 @@ const ErrorState = styled(LoadingState)`
 
 const Analytics = () => {
     const [data, setData] = useState(null);
+    const [timeSeries, setTimeSeries] = useState([]);
     const [isLoading, setIsLoading] = useState(true);
     const [error, setError] = useState(null);
 
@@ -144,8 +145,12 @@ const Analytics = () => {
             try {
                 setIsLoading(true);
                 setError(null);
-                const response = await fetchAnalytics();
+                const [response, series] = await Promise.all([
+                    fetchAnalytics(),
+                    fetchTimeSeries({ granularity: 'hour' })
+                ]);
                 setData(response);
+                setTimeSeries(toChartRows(series));
             } catch (err) {
                 setError(err.message);
                 console.error('Error fetching analytics:', err);
@@ -283,6 +288,28 @@ const Analytics = () => {
                     </MetricsList>
                 </ChartCard>
             </ChartGrid>
+
+            <ChartCard style={{ marginTop: 24 }}>
+                <h2>Last 7 Days (hourly)</h2>
+                <div style={{ height: 300 }}>
+                    <ResponsiveContainer width="100%" height="100%">
+                        <LineChart data={timeSeries}>
+                            <CartesianGrid strokeDasharray="3 3" />
+                            <XAxis
+                                dataKey="timestamp"
+                                tickFormatter={(value) => new Date(value).toLocaleDateString()}
+                                minTickGap={40}
+                            />
+                            <YAxis />
+                            <Tooltip labelFormatter={(value) => new Date(value).toLocaleString()} />
+                            <Legend />
+                            <Line type="monotone" dataKey="sent" stroke="#059669" dot={false} isAnimationActive={false} />
+                            <Line type="monotone" dataKey="failed" stroke="#dc2626" dot={false} isAnimationActive={false} />
+                            <Line type="monotone" dataKey="bounces" stroke="#d97706" dot={false} isAnimationActive={false} />
+                        </LineChart>
+                    </ResponsiveContainer>
+                </div>
+            </ChartCard>
         </Container>
     );
 };
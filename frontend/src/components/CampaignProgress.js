@@ -0,0 +1,35 @@
+import React, { useEffect, useState } from 'react';
+import { watchCampaign } from '../api';
+
+const CampaignProgress = ({ campaignId }) => {
+    const [progress, setProgress] = useState(null);
+    const [done, setDone] = useState(null);
+
+    useEffect(() => {
+        setProgress(null);
+        setDone(null);
+        return watchCampaign(campaignId, setProgress, setDone);
+    }, [campaignId]);
+
+    if (!progress) {
+        return <div className="mt-3">Waiting for campaign {campaignId}...</div>;
+    }
+
+    return (
+        <div className="mt-3 border p-3 rounded">
+            <div><strong>Campaign:</strong> {campaignId}</div>
+            <div><strong>Status:</strong> {done ? done.status : progress.status}</div>
+            <div>
+                Sent: {progress.succeeded} | Failed: {progress.failed} | Rejected: {progress.rejected}
+            </div>
+            {progress.throughput_per_second !== undefined && (
+                <div>Throughput: {progress.throughput_per_second} emails/s</div>
+            )}
+            {done && done.error && (
+                <div className="alert alert-danger mt-2" role="alert">{done.error}</div>
+            )}
+        </div>
+    );
+};
+
+export default CampaignProgress;
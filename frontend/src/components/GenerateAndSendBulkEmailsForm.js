@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
-import { generateAndSendBulkEmail } from '../api';
+import { submitGenerateAndSendBulkCampaign } from '../api';
+import CampaignProgress from './CampaignProgress';
 
 const GenerateAndSendBulkEmailsForm = () => {
     const [file, setFile] = useState(null);
@@ -7,6 +8,7 @@ const GenerateAndSendBulkEmailsForm = () => {
     const [keywords, setKeywords] = useState('');
     const [recipientColumn, setRecipientColumn] = useState('');
     const [scheduledTime, setScheduledTime] = useState('');
+    const [campaignId, setCampaignId] = useState(null);
 
     const handleSubmit = async (e) => {
         e.preventDefault();
@@ -18,8 +20,8 @@ const GenerateAndSendBulkEmailsForm = () => {
         formData.append('scheduled_time', scheduledTime ? new Date(scheduledTime).toISOString() : null);
 
         try {
-            const response = await generateAndSendBulkEmail(formData);
-            alert(`Bulk emails processed successfully!`);
+            const result = await submitGenerateAndSendBulkCampaign(formData);
+            setCampaignId(result.campaign_id);
         } catch (error) {
             alert('Error generating and sending bulk emails: ' + error.message);
         }
@@ -83,6 +85,7 @@ const GenerateAndSendBulkEmailsForm = () => {
                     Generate and Send Bulk Emails
                 </button>
             </form>
+            {campaignId && <CampaignProgress campaignId={campaignId} />}
         </div>
     );
 };
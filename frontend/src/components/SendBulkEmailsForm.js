@@ -1,5 +1,6 @@
 import React, { useState } from 'react';
-import { SendBulkEmails } from '../api';
+import { submitBulkCampaign } from '../api';
+import CampaignProgress from './CampaignProgress';
 
 const SendBulkEmailsForm = () => {
     const [file, setFile] = useState(null);
@@ -10,6 +11,7 @@ const SendBulkEmailsForm = () => {
     const [scheduledTime, setScheduledTime] = useState('');
     const [isLoading, setIsLoading] = useState(false);
     const [error, setError] = useState('');
+    const [campaignId, setCampaignId] = useState(null);
 
     const handleSubmit = async (e) => {
         e.preventDefault();
@@ -29,20 +31,8 @@ const SendBulkEmailsForm = () => {
             const formData = new FormData();
             formData.append('file', file);
 
-            const url = `http://localhost:8000/csv/send-bulk-emails?${params.toString()}`;
-
-            const response = await fetch(url, {
-                method: 'POST',
-                body: formData
-            });
-
-            if (!response.ok) {
-                const errorData = await response.json();
-                throw new Error(errorData.detail || 'Failed to send emails');
-            }
-
-            const result = await response.json();
-            alert('Bulk emails generated and sent successfully!');
+            const result = await submitBulkCampaign(params.toString(), formData);
+            setCampaignId(result.campaign_id);
         } catch (error) {
             setError(error.message);
         } finally {
@@ -130,6 +120,7 @@ const SendBulkEmailsForm = () => {
                     {isLoading ? 'Sending...' : 'Send Bulk Emails'}
                 </button>
             </form>
+            {campaignId && <CampaignProgress campaignId={campaignId} />}
         </div>
     );
 };